@@ -0,0 +1,413 @@
+"""
+Miss AI – X Growth Architect | Engagement analytics + posting times
+==================================================================
+Grounds the METADATA "Suggested Posting Times" in our own X analytics
+instead of the model's guess.
+
+  - import: X analytics exports (CSV or JSON) go into a columnar store,
+    one NumPy array per column (ANALYTICS_STORE), deduplicated by post id
+  - join: every post is matched by text to the stored content packages
+    (store.py), which gives it the content pillar it was written for
+  - query: engagement rate per weekday + hour slot, overall and per pillar,
+    with bincount over the columns (milliseconds for years of posts)
+
+Slots are shrunk towards the overall rate (ANALYTICS_PRIOR_IMPRESSIONS), so
+a slot with one lucky post does not win, and a pillar with little history
+falls back to the account-wide pattern.
+
+numpy is optional: without it imports fail with a clear message and the
+model's own posting times are kept.
+
+ANALYTICS_STORE holds the main Miss AI account. Other brands (tenants.py)
+each point "analytics_store" at their own store; a tenant without one keeps
+the model's posting times rather than borrowing another account's slots.
+
+HOW TO RUN:
+    python3 analytics.py import account_analytics.csv
+    python3 analytics.py slots
+    python3 analytics.py slots --pillar "AI Automation and Real Results"
+    python3 analytics.py import kiwi_analytics.csv --store output/analytics/nz-realestate.npz
+"""
+
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from fsutil import write_atomic
+
+try:
+    import numpy as np
+except ImportError:  # optional; posting times are then left to the model
+    np = None
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+ANALYTICS_STORE = os.path.join("output", "analytics", "posts.npz")
+
+# Markdown packages from before the package store (store.py), also joined
+ARCHIVE_GLOB = os.path.join("output", "**", "*.md")
+
+# Timezone the posting slots are computed and shown in
+POSTING_TIMEZONE = "America/New_York"
+
+# Slots suggested per package (the output format asks for two)
+SUGGESTED_SLOTS = 2
+
+# A slot needs this many posts before it can be suggested
+MIN_SLOT_POSTS = 3
+
+# Impressions worth of "average" engagement added to every slot (shrinkage)
+ANALYTICS_PRIOR_IMPRESSIONS = 2000
+
+# Export column names (lowercased, letters only) -> store column
+_COLUMN_ALIASES = {
+    "id": ["tweetid", "postid", "id"],
+    "text": ["tweettext", "posttext", "text", "fulltext"],
+    "time": ["time", "date", "createdat", "posted"],
+    "impressions": ["impressions"],
+    "engagements": ["engagements"],
+}
+
+_WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_LINK_RE = re.compile(r"https?://\S+")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+_PILLAR_RE = re.compile(r"^\*\*Content Pillar:\*\*\s*(.+?)\s*$", re.MULTILINE)
+_POSTING_TIMES_RE = re.compile(r"^(- \*\*Suggested Posting Times:\*\*).*$", re.MULTILINE)
+_MAIN_PILLAR_RE = re.compile(r"^- \*\*Main Pillar:\*\*\s*(.+?)\s*$", re.MULTILINE)
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Engagement analytics need numpy: python3 -m pip install numpy")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# IMPORT
+# ─────────────────────────────────────────────────────────────────────────────
+
+def normalize_text(text: str) -> str:
+    """
+    Join key for a post: links removed (X rewrites them to t.co), lowercase, words only.
+    """
+    return _NON_WORD_RE.sub(" ", _LINK_RE.sub("", text).lower()).strip()[:200]
+
+
+def _parse_time(value) -> datetime:
+    """
+    Timestamps as found in X exports: "2024-03-05 14:22 +0000", ISO 8601,
+    "Wed Oct 10 20:19:24 +0000 2018", "Tue, Mar 05, 2024", or epoch seconds.
+    Always timezone-aware: times without a zone are UTC, never the host's zone.
+    """
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    value = str(value).strip()
+    for fmt in ("%Y-%m-%d %H:%M %z", "%a %b %d %H:%M:%S %z %Y", "%a, %b %d, %Y"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _number(value) -> int:
+    try:
+        return int(float(str(value).replace(",", "") or 0))
+    except ValueError:
+        return 0
+
+
+def read_export(path: str) -> list:
+    """
+    Rows of {"id", "text", "time", "impressions", "engagements"} from an X analytics
+    export, either the CSV download or a JSON list of objects.
+    """
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            raw = json.load(f)
+        if isinstance(raw, dict):
+            raw = raw.get("data") or raw.get("posts") or []
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            raw = list(csv.DictReader(f))
+
+    rows = []
+    for record in raw:
+        fields = {re.sub(r"[^a-z]", "", str(key).lower()): value for key, value in record.items()}
+        row = {}
+        for column, aliases in _COLUMN_ALIASES.items():
+            row[column] = next((fields[a] for a in aliases if a in fields), None)
+        if not row["text"] or row["time"] is None:
+            continue
+        try:
+            row["time"] = _parse_time(row["time"])
+        except ValueError:
+            continue
+        row["id"] = str(row["id"] or f"{row['time'].timestamp():.0f}:{normalize_text(row['text'])[:40]}")
+        row["impressions"] = _number(row["impressions"])
+        row["engagements"] = _number(row["engagements"])
+        rows.append(row)
+    return rows
+
+
+def archived_posts(pattern: str = ARCHIVE_GLOB) -> dict:
+    """
+    {normalized post text: content pillar} for every post in the package store,
+    plus older packages saved as markdown files.
+    """
+    from store import get_store
+    from variants import parse_package, post_text
+
+    packages = [record["content"] for record in get_store().iter_records()]
+    for path in glob.glob(pattern, recursive=True):
+        try:
+            with open(path, encoding="utf-8") as f:
+                packages.append(f.read())
+        except OSError:
+            continue
+
+    pillars = {}
+    for package in packages:
+        for title, body in parse_package(package).items():
+            if not title.upper().startswith(("LONG POST", "SHORT POST", "POLL")):
+                continue
+            match = _PILLAR_RE.search(body)
+            if match:
+                pillars[normalize_text(post_text(body))] = match.group(1)
+    return pillars
+
+# ─────────────────────────────────────────────────────────────────────────────
+# COLUMNAR STORE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class PostStore:
+    """
+    One NumPy array per column, all the same length:
+        ids, texts (str), timestamps (int64, UTC seconds),
+        impressions, engagements (int64), weekday, hour (int8, POSTING_TIMEZONE),
+        pillar (int16, index into `pillars`, -1 when unknown)
+    """
+
+    COLUMNS = ("ids", "texts", "timestamps", "impressions", "engagements", "weekday", "hour", "pillar")
+
+    def __init__(self, columns: dict = None, pillars: list = None):
+        _require_numpy()
+        columns = columns or {}
+        self.ids = columns.get("ids", np.array([], dtype=str))
+        self.texts = columns.get("texts", np.array([], dtype=str))
+        self.timestamps = columns.get("timestamps", np.array([], dtype=np.int64))
+        self.impressions = columns.get("impressions", np.array([], dtype=np.int64))
+        self.engagements = columns.get("engagements", np.array([], dtype=np.int64))
+        self.weekday = columns.get("weekday", np.array([], dtype=np.int8))
+        self.hour = columns.get("hour", np.array([], dtype=np.int8))
+        self.pillar = columns.get("pillar", np.array([], dtype=np.int16))
+        self.pillars = list(pillars or [])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def pillar_index(self, name: str) -> int:
+        """
+        Index of a pillar in `pillars` (case-insensitive), or -1.
+        """
+        folded = [p.casefold() for p in self.pillars]
+        return folded.index(name.casefold()) if name.casefold() in folded else -1
+
+    @classmethod
+    def load(cls, path: str = ANALYTICS_STORE) -> "PostStore":
+        _require_numpy()
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as data:
+            columns = {name: data[name] for name in cls.COLUMNS}
+            pillars = data["pillars"].tolist()
+        return cls(columns, pillars)
+
+    def save(self, path: str = ANALYTICS_STORE):
+        buffer = io.BytesIO()
+        np.savez(buffer, pillars=np.array(self.pillars, dtype=str),
+                 **{name: getattr(self, name) for name in self.COLUMNS})
+        write_atomic(path, buffer.getvalue())
+
+    def add(self, rows: list, pillar_by_text: dict) -> int:
+        """
+        Add export rows, replacing posts already in the store (newer metrics win).
+        Returns the number of posts matched to an archived package.
+        """
+        tz = ZoneInfo(POSTING_TIMEZONE)
+        latest = {row["id"]: row for row in rows}
+        keep = ~np.isin(self.ids, list(latest)) if len(self) else np.array([], dtype=bool)
+
+        matched = 0
+        new_pillars = []
+        for row in latest.values():
+            pillar = pillar_by_text.get(normalize_text(row["text"]))
+            if pillar is None:
+                new_pillars.append(-1)
+                continue
+            matched += 1
+            if self.pillar_index(pillar) < 0:
+                self.pillars.append(pillar)
+            new_pillars.append(self.pillar_index(pillar))
+
+        local = [row["time"].astimezone(tz) for row in latest.values()]
+        new = {
+            "ids": np.array(list(latest), dtype=str),
+            "texts": np.array([row["text"] for row in latest.values()], dtype=str),
+            "timestamps": np.array([int(row["time"].timestamp()) for row in latest.values()], dtype=np.int64),
+            "impressions": np.array([row["impressions"] for row in latest.values()], dtype=np.int64),
+            "engagements": np.array([row["engagements"] for row in latest.values()], dtype=np.int64),
+            "weekday": np.array([t.weekday() for t in local], dtype=np.int8),
+            "hour": np.array([t.hour for t in local], dtype=np.int8),
+            "pillar": np.array(new_pillars, dtype=np.int16),
+        }
+        for name in self.COLUMNS:
+            old = getattr(self, name)[keep] if len(self) else getattr(self, name)
+            setattr(self, name, np.concatenate([old, new[name]]))
+        return matched
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def slot_rates(self, pillar: str = None):
+        """
+        (rates, posts): two length-168 arrays indexed by weekday * 24 + hour.
+        Rates are engagements / impressions, shrunk towards the overall rate;
+        for a pillar, shrunk towards the account-wide slot rate instead.
+        """
+        slot = self.weekday.astype(np.int64) * 24 + self.hour
+        impressions = np.bincount(slot, weights=self.impressions, minlength=168)
+        engagements = np.bincount(slot, weights=self.engagements, minlength=168)
+        posts = np.bincount(slot, minlength=168)
+
+        overall = engagements.sum() / max(impressions.sum(), 1)
+        prior = ANALYTICS_PRIOR_IMPRESSIONS
+        rates = (engagements + prior * overall) / (impressions + prior)
+        index = self.pillar_index(pillar) if pillar else -1
+        if index < 0:
+            return rates, posts
+
+        mask = self.pillar == index
+        p_impressions = np.bincount(slot[mask], weights=self.impressions[mask], minlength=168)
+        p_engagements = np.bincount(slot[mask], weights=self.engagements[mask], minlength=168)
+        return (p_engagements + prior * rates) / (p_impressions + prior), posts
+
+    def best_slots(self, pillar: str = None, n: int = SUGGESTED_SLOTS) -> list:
+        """
+        Up to n (weekday, hour, rate) slots with the highest engagement rate,
+        at most one per weekday, among slots with MIN_SLOT_POSTS posts.
+        """
+        if not len(self):
+            return []
+        rates, posts = self.slot_rates(pillar)
+        rates = np.where(posts >= MIN_SLOT_POSTS, rates, -1.0)
+
+        slots = []
+        for index in np.argsort(rates)[::-1]:
+            if rates[index] < 0 or len(slots) == n:
+                break
+            weekday, hour = divmod(int(index), 24)
+            if all(weekday != s[0] for s in slots):
+                slots.append((weekday, hour, float(rates[index])))
+        return slots
+
+
+_store_cache = {}
+_store_lock = threading.Lock()
+
+
+def get_store(path: str = ANALYTICS_STORE):
+    """
+    The store at `path`, loaded once per file version. None when numpy is
+    missing or nothing has been imported yet.
+    """
+    if np is None or not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    with _store_lock:
+        cached = _store_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _store_cache[path] = (mtime, PostStore.load(path))
+        return cached[1]
+
+
+def import_export(export_path: str, store_path: str = ANALYTICS_STORE) -> tuple:
+    """
+    Import one analytics export into the store. Returns (posts imported, matched to a pillar).
+    """
+    _require_numpy()
+    rows = read_export(export_path)
+    store = PostStore.load(store_path)
+    matched = store.add(rows, archived_posts())
+    store.save(store_path)
+    return len(rows), matched
+
+# ─────────────────────────────────────────────────────────────────────────────
+# POSTING TIMES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def format_slot(weekday: int, hour: int) -> str:
+    """
+    "Tuesday 8am EST", in the output format's style.
+    """
+    label = f"{hour % 12 or 12}{'am' if hour < 12 else 'pm'}"
+    zone = datetime.now(ZoneInfo(POSTING_TIMEZONE)).strftime("%Z")
+    return f"{_WEEKDAYS[weekday]} {label} {zone}"
+
+
+def fill_posting_times(content: str, store=None) -> str:
+    """
+    Replace the model's "Suggested Posting Times" with the best slots from our
+    analytics for the package's main pillar. Unchanged when there is no data.
+    """
+    store = store if store is not None else get_store()
+    if store is None:
+        return content
+    match = _MAIN_PILLAR_RE.search(content)
+    slots = store.best_slots(match.group(1) if match else None)
+    if not slots:
+        return content
+    times = " · ".join(format_slot(weekday, hour) for weekday, hour, _ in slots)
+    return _POSTING_TIMES_RE.sub(lambda m: f"{m.group(1)} {times} (from our analytics)", content, count=1)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Miss AI engagement analytics")
+    sub = parser.add_subparsers(dest="command", required=True)
+    importer = sub.add_parser("import", help="import an X analytics export (CSV or JSON)")
+    importer.add_argument("export")
+    slots = sub.add_parser("slots", help="show the best posting slots")
+    slots.add_argument("--pillar")
+    for command in (importer, slots):
+        command.add_argument(
+            "--store", default=ANALYTICS_STORE, help=f"analytics store (default {ANALYTICS_STORE}; one per account)"
+        )
+    args = parser.parse_args()
+
+    if args.command == "import":
+        imported, matched = import_export(args.export, args.store)
+        print(f"Imported {imported} posts ({matched} matched to an archived package).")
+    elif args.command == "slots":
+        _require_numpy()
+        store = get_store(args.store)
+        if store is None:
+            print("No analytics yet. Import an export first: python3 analytics.py import <file>")
+            return
+        print(f"{len(store)} posts, pillars: {', '.join(store.pillars) or 'none matched'}")
+        for weekday, hour, rate in store.best_slots(args.pillar, n=5):
+            print(f"  {format_slot(weekday, hour):22s} {rate * 100:5.2f}% engagement")
+
+
+if __name__ == "__main__":
+    main()
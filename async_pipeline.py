@@ -0,0 +1,187 @@
+"""
+Miss AI – X Growth Architect | Async pipeline
+============================================
+asyncio-native version of the fetch -> generate path, next to the sync API
+in main.py and with the same signatures. Feeds are fetched concurrently with
+httpx and generation goes through AsyncAnthropic, so one event loop can run
+many generations at once (python3 main.py --async, a future server mode,
+batch jobs). The Streamlit app keeps its thread-pool jobs, which already run
+concurrently and are what its per-job profiling samples.
+
+Every stage has its own timeout. A slow feed is dropped instead of holding
+up the run, and cancelling the task running a stage cancels all in-flight
+requests. Generation is hedged and falls back through the model cascade
+exactly like the sync path (resilience.generate_resilient_async).
+
+USAGE:
+    import asyncio
+    from async_pipeline import fetch_all_news_items_async, generate_content_async
+    from sources import load_sources
+
+    items = asyncio.run(fetch_all_news_items_async(sources=load_sources("sources.json")))
+    content = asyncio.run(generate_content_async(main.build_news_bundle(items)))
+"""
+
+import asyncio
+import weakref
+
+import anthropic
+import httpx
+
+import main
+from resilience import cascade_for, generate_resilient_async
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Per-request timeout for a single feed (seconds)
+FEED_TIMEOUT = 10
+
+# Whole fetch stage; feeds still running after this are cancelled and skipped
+FETCH_STAGE_TIMEOUT = 20
+
+# Whole generation stage, including hedged and fallback attempts
+GENERATE_STAGE_TIMEOUT = 120
+
+# Maximum feed requests in flight at once
+FEED_CONCURRENCY = 16
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FETCH
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def _fetch_one_feed_async(http: httpx.AsyncClient, url: str, cutoff, limit: asyncio.Semaphore) -> list:
+    """
+    Async counterpart of main._fetch_one_feed. Parsing runs in a worker thread
+    so a huge feed does not block the event loop.
+    """
+    async with limit:
+        try:
+            resp = await http.get(url)
+            resp.raise_for_status()
+        except (httpx.HTTPError, OSError):
+            return []
+    return await asyncio.to_thread(main.parse_feed, resp.content, url, cutoff)
+
+
+async def fetch_feed_items_async(
+    hours: int = 24,
+    feeds: list = None,
+    sources: list = None,
+    stage_timeout: float = FETCH_STAGE_TIMEOUT,
+) -> dict:
+    """
+    Async counterpart of main.fetch_feed_items: {feed url: [article dicts]}.
+    Feeds that have not answered within `stage_timeout` are cancelled and
+    skipped. Extra source adapters run in a worker thread alongside the feeds,
+    under their own SOURCE_TIMEOUT (see sources.fetch_from_sources).
+    """
+    feeds = feeds or main.NEWS_RSS_FEEDS
+    limit = asyncio.Semaphore(FEED_CONCURRENCY)
+    cutoff = main.window_cutoff(hours)
+
+    print(f"\nFetching news from {len(feeds)} RSS feeds (last {hours} hours, async)...")
+
+    extra = None
+    if sources:
+        from sources import fetch_from_sources
+
+        extra = asyncio.ensure_future(asyncio.to_thread(fetch_from_sources, list(sources), cutoff))
+
+    async with httpx.AsyncClient(
+        timeout=FEED_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": main.FEED_USER_AGENT},
+    ) as http:
+        tasks = {
+            asyncio.create_task(_fetch_one_feed_async(http, url, cutoff, limit)): url
+            for url in feeds
+        }
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=stage_timeout)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            if extra:
+                extra.cancel()
+            raise
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    feed_items = {url: [] for url in feeds}
+    for task in done:
+        if not task.cancelled() and task.exception() is None:
+            feed_items[tasks[task]] = task.result()
+    if extra:
+        feed_items.update(await extra)
+    return feed_items
+
+
+async def fetch_all_news_items_async(
+    hours: int = 24,
+    max_items: int = main.MAX_ITEMS,
+    feeds: list = None,
+    sources: list = None,
+    window=None,
+    stage_timeout: float = FETCH_STAGE_TIMEOUT,
+) -> list:
+    """
+    Async counterpart of main.fetch_all_news_items: the same deduplicated,
+    ranked items, with the feeds fetched concurrently.
+    """
+    feed_items = await fetch_feed_items_async(hours=hours, feeds=feeds, sources=sources, stage_timeout=stage_timeout)
+    return main.select_recent(feed_items, hours=hours, max_items=max_items, window=window)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GENERATE
+# ─────────────────────────────────────────────────────────────────────────────
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> anthropic.AsyncAnthropic:
+    """
+    One AsyncAnthropic client per event loop (its connection pool is bound to the loop).
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = anthropic.AsyncAnthropic(api_key=main.ANTHROPIC_API_KEY)
+        _clients[loop] = client
+    return client
+
+
+async def generate_content_async(
+    news_bundle: str,
+    verbose: bool = True,
+    system_prompt: str = main.SYSTEM_PROMPT,
+    brand: str = "Miss AI",
+    budget_key: str = "cli",
+    category: str = main.NEWS_CATEGORY,
+    audience: str = main.TARGET_AUDIENCE,
+    stage_timeout: float = GENERATE_STAGE_TIMEOUT,
+) -> str:
+    """
+    Async counterpart of main.generate_content (same arguments), hedged and
+    with model fallback (see resilience.py).
+    Raises asyncio.TimeoutError if the call takes longer than `stage_timeout`
+    (time spent queueing for the rate limiter counts towards it).
+    """
+    if verbose:
+        print("\nGenerating content from news bundle (async)...")
+        print("Calling Claude API — this takes about 15–30 seconds...\n")
+
+    return await asyncio.wait_for(
+        generate_resilient_async(
+            get_async_client(),
+            budget_key,
+            models=cascade_for(main.MODEL),
+            max_tokens=4096,
+            system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+            messages=[{"role": "user", "content": main.build_user_message(news_bundle, brand, category, audience)}],
+        ),
+        timeout=stage_timeout,
+    )
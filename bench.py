@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Miss AI – X Growth Architect | Benchmarks
+========================================
+Small, dependency-free benchmarks for the things that matter when n8n or
+cron cold-starts the CLI.
+
+HOW TO RUN:
+    python3 bench.py startup            # import costs + time to first API request
+    python3 bench.py startup --runs 10
+    python3 bench.py resilience         # hedging / fallback against the stub API in tests/stubs.py
+    python3 bench.py analytics          # posting-slot queries over years of post history
+    python3 bench.py memory             # rolling article window, 1000 feeds polled for two days
+    python3 bench.py store              # package store appends vs one markdown file per package
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(HERE, "main.py")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STARTUP
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _wall(cmd: list, **kwargs) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, capture_output=True, **kwargs)
+    return time.perf_counter() - start
+
+
+def import_costs(module: str = "main", top: int = 10) -> tuple:
+    """
+    Run `python -X importtime -c "import <module>"` and return
+    (cumulative microseconds for the module itself,
+     [(cumulative us, module name)] for the top-level imports).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only top-level entries add up to the total
+        if len(name) - len(name.lstrip()) == 1:
+            rows.append((int(cumulative_us), name.strip()))
+    total = next((us for us, name in rows if name == module), 0)
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def time_to_request(runs: int) -> list:
+    """
+    Seconds from launching `main.py "<topic>"` to the Messages API request
+    arriving at a local stub server, one value per run.
+    """
+    from tests.stubs import StubMessages
+
+    stub = StubMessages()
+    env = dict(os.environ, ANTHROPIC_API_KEY="sk-ant-bench", ANTHROPIC_BASE_URL=stub.url)
+
+    timings = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            stub.arrivals.clear()
+            start = time.monotonic()
+            subprocess.run(
+                [sys.executable, MAIN, "bench topic"],
+                cwd=workdir,
+                env=env,
+                capture_output=True,
+                check=True,
+            )
+            timings.append(stub.arrivals[0] - start)
+    stub.close()
+    return timings
+
+
+def bench_startup(runs: int):
+    baseline = statistics.median(_wall([sys.executable, "-c", "pass"]) for _ in range(runs))
+    import_main = statistics.median(_wall([sys.executable, "-c", "import main"], cwd=HERE) for _ in range(runs))
+
+    print(f"Interpreter startup (python -c pass):   {baseline * 1000:7.1f} ms")
+    print(f"python -c 'import main':                {import_main * 1000:7.1f} ms")
+
+    total, rows = import_costs("main")
+    print(f"\nimport main (-X importtime, cumulative): {total / 1000:6.1f} ms")
+    for us, name in rows:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    try:
+        timings = time_to_request(runs)
+    except (subprocess.CalledProcessError, IndexError) as e:
+        print(f"\nTime to API request: skipped ({e.__class__.__name__}; is the anthropic SDK installed?)")
+        return
+    print(f"\nmain.py \"topic\" -> API request (median of {runs}): {statistics.median(timings) * 1000:7.1f} ms")
+
+    total, rows = import_costs("anthropic", top=5)
+    print(f"  of which importing the anthropic SDK: {total / 1000:7.1f} ms")
+    print(f"  of which interpreter startup:         {baseline * 1000:7.1f} ms")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RESILIENCE
+# ─────────────────────────────────────────────────────────────────────────────
+
+RESILIENCE_SCENARIOS = [
+    ("healthy", ["ok"]),
+    ("529 on primary -> fallback model", ["529"]),
+    ("500 on primary -> fallback model", ["500"]),
+    ("slow first token -> hedged duplicate wins", ["slow:3"]),
+    ("everything overloaded -> error", ["529", "529", "529"]),
+]
+
+
+def bench_resilience(hedge_seconds: float):
+    try:
+        import anthropic
+    except ImportError:
+        print("Skipped: the anthropic SDK is not installed.")
+        return
+
+    import budget
+    import resilience
+    from tests.stubs import StubMessages
+
+    workdir = tempfile.mkdtemp()
+    budget._governor = budget.Governor(budget.Ledger(os.path.join(workdir, "ledger.json")))
+    resilience._tracker = resilience.LatencyTracker(os.path.join(workdir, "latency.json"))
+    resilience.HEDGE_DEFAULT_SECONDS = hedge_seconds
+
+    stub = StubMessages()
+    client = anthropic.Anthropic(api_key="sk-ant-bench", base_url=stub.url)
+
+    print(f"Hedge threshold: {hedge_seconds:.2f}s, cascade: {' -> '.join(resilience.MODEL_CASCADE)}\n")
+    for name, script in RESILIENCE_SCENARIOS:
+        stub.script = list(script)
+        start = time.perf_counter()
+        try:
+            outcome = resilience.generate_resilient(
+                client, "bench", max_tokens=16, messages=[{"role": "user", "content": "hi"}]
+            )
+        except Exception as e:
+            outcome = f"raised {e.__class__.__name__}"
+        print(f"  {name:45s} {time.perf_counter() - start:6.2f}s  {outcome}")
+    stub.close()
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ANALYTICS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def bench_analytics(years: int, posts_per_day: int):
+    try:
+        import numpy as np
+    except ImportError:
+        print("Skipped: numpy is not installed.")
+        return
+
+    import analytics
+
+    n = years * 365 * posts_per_day
+    rng = np.random.default_rng(0)
+    weekday = rng.integers(0, 7, n).astype(np.int8)
+    hour = rng.integers(0, 24, n).astype(np.int8)
+    impressions = rng.integers(100, 20_000, n)
+    # Tuesday and Thursday mornings do better, so there is something to find
+    boost = np.where(np.isin(weekday, [1, 3]) & (hour >= 8) & (hour <= 10), 2.0, 1.0)
+    engagements = (impressions * rng.uniform(0.005, 0.03, n) * boost).astype(np.int64)
+    store = analytics.PostStore({
+        "ids": np.arange(n).astype(str),
+        "texts": np.array(["post"] * n),
+        "timestamps": np.arange(n, dtype=np.int64),
+        "impressions": impressions,
+        "engagements": engagements,
+        "weekday": weekday,
+        "hour": hour,
+        "pillar": rng.integers(-1, 4, n).astype(np.int16),
+    }, pillars=["AI", "Founders", "SMB", "Money"])
+
+    path = os.path.join(tempfile.mkdtemp(), "posts.npz")
+    store.save(path)
+    print(f"{n:,} posts ({years} years x {posts_per_day}/day), store {os.path.getsize(path) / 1e6:.1f} MB\n")
+
+    def timed(label, fn, runs=20):
+        start = time.perf_counter()
+        for _ in range(runs):
+            result = fn()
+        print(f"  {label:35s} {(time.perf_counter() - start) / runs * 1000:7.2f} ms")
+        return result
+
+    timed("load store", lambda: analytics.PostStore.load(path), runs=5)
+    slots = timed("best slots (all posts)", lambda: store.best_slots())
+    timed("best slots (one pillar)", lambda: store.best_slots("SMB"))
+    print(f"\n  best: {', '.join(analytics.format_slot(d, h) for d, h, _ in slots)}")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MEMORY
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _synthetic_feed(feed: int, now: float, per_hour: float, entries: int) -> list:
+    """
+    The `entries` latest article dicts of a fake feed that publishes `per_hour` items an hour.
+    """
+    from datetime import datetime, timezone
+
+    interval = 3600 / per_hour
+    newest = int((now + feed * 7) // interval)
+    return [
+        {
+            "title": f"Feed {feed} story {n}: AI startup raises a round to automate SMB invoicing",
+            "summary": f"Story {n} from feed {feed}. " + "Founders say the tool saves hours every week. " * 8,
+            "link": f"https://feed{feed}.example.com/story/{n}",
+            "published": datetime.fromtimestamp(n * interval - feed * 7, tz=timezone.utc),
+        }
+        for n in range(newest, newest - entries, -1)
+    ]
+
+
+def bench_memory(feeds: int, hours: int, poll_minutes: int, per_hour: float):
+    import tracemalloc
+
+    from window import ArticleWindow
+
+    window = ArticleWindow(hours=24)
+    urls = [f"https://feed{feed}.example.com/rss" for feed in range(feeds)]
+    start = 1_800_000_000.0
+    polls = hours * 60 // poll_minutes
+
+    print(f"{feeds} feeds x {per_hour:g} items/hour, polled every {poll_minutes} min for {hours}h, 24h window\n")
+    print("   hour   articles   traced MB")
+    tracemalloc.start()
+    began = time.perf_counter()
+    for poll in range(1, polls + 1):
+        now = start + poll * poll_minutes * 60
+        for feed, url in enumerate(urls):
+            window.extend(url, _synthetic_feed(feed, now, per_hour, entries=10), now=now)
+        if (poll * poll_minutes) % (4 * 60) == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"  {poll * poll_minutes // 60:5d}   {len(window):8,d}   {current / 1e6:9.1f}")
+    elapsed = time.perf_counter() - began
+
+    before, _ = tracemalloc.get_traced_memory()
+    as_dicts = window.items(now=now)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n  {polls * feeds:,} feed polls in {elapsed:.1f}s (under tracemalloc)")
+    print(f"  the same {len(as_dicts):,} articles as dicts: +{(after - before) / 1e6:.1f} MB on top of the window")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PACKAGE STORE
+# ─────────────────────────────────────────────────────────────────────────────
+
+def bench_store(packages: int, tenants: int):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import store
+
+    sample = sorted(f for f in os.listdir(os.path.join(HERE, "output")) if f.endswith(".md"))
+    if sample:
+        with open(os.path.join(HERE, "output", sample[-1]), encoding="utf-8") as f:
+            content = f.read()
+    else:
+        content = "## LONG POST\n" + "Founders, this is the AI play for this week. " * 100
+
+    with tempfile.TemporaryDirectory() as workdir:
+        package_store = store.PackageStore(os.path.join(workdir, "store"))
+
+        def append(n: int):
+            package_store.append(f"News {n}", content, tenant_id=f"tenant-{n % tenants}")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=tenants) as pool:
+            list(pool.map(append, range(packages)))
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(workdir, "store", f)) for f in os.listdir(os.path.join(workdir, "store")))
+        files = len(os.listdir(os.path.join(workdir, "store")))
+
+        start = time.perf_counter()
+        for _ in package_store.iter_records():
+            pass
+        scan = time.perf_counter() - start
+
+        markdown_dir = os.path.join(workdir, "markdown")
+        os.makedirs(markdown_dir)
+        start = time.perf_counter()
+        for n in range(packages):
+            with open(os.path.join(markdown_dir, f"{n}.md"), "w", encoding="utf-8") as f:
+                f.write(content)
+        markdown = time.perf_counter() - start
+        markdown_size = packages * len(content.encode("utf-8"))
+
+    print(f"{packages} packages of {len(content):,} chars from {tenants} concurrent writers\n")
+    print(f"  store (fsync each):   {elapsed / packages * 1000:6.2f} ms/package, {files} files, {size / 1e6:6.2f} MB")
+    print(f"  markdown per file:    {markdown / packages * 1000:6.2f} ms/package, {packages} files, {markdown_size / 1e6:6.2f} MB (no fsync)")
+    print(f"  full scan of the store: {scan * 1000:.1f} ms")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Miss AI benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    startup = sub.add_parser("startup", help="CLI import and time-to-request costs")
+    startup.add_argument("--runs", type=int, default=5)
+    hedging = sub.add_parser("resilience", help="hedging and model fallback against a faulty stub API")
+    hedging.add_argument("--hedge-seconds", type=float, default=0.5)
+    history = sub.add_parser("analytics", help="posting-slot queries over a synthetic post history")
+    history.add_argument("--years", type=int, default=5)
+    history.add_argument("--posts-per-day", type=int, default=20)
+    memory = sub.add_parser("memory", help="footprint of the rolling article window over a long polling run")
+    memory.add_argument("--feeds", type=int, default=1000)
+    memory.add_argument("--hours", type=int, default=48)
+    memory.add_argument("--poll-minutes", type=int, default=30)
+    memory.add_argument("--per-hour", type=float, default=1.0)
+    packages = sub.add_parser("store", help="package store writes under a multi-tenant batch")
+    packages.add_argument("--packages", type=int, default=500)
+    packages.add_argument("--tenants", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.bench == "startup":
+        bench_startup(args.runs)
+    elif args.bench == "resilience":
+        bench_resilience(args.hedge_seconds)
+    elif args.bench == "analytics":
+        bench_analytics(args.years, args.posts_per_day)
+    elif args.bench == "memory":
+        bench_memory(args.feeds, args.hours, args.poll_minutes, args.per_hour)
+    elif args.bench == "store":
+        bench_store(args.packages, args.tenants)
+
+
+if __name__ == "__main__":
+    main()
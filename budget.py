@@ -0,0 +1,292 @@
+"""
+Miss AI – X Growth Architect | Token budget governor
+===================================================
+Process-wide guard around every messages.create call:
+
+  - a persisted daily ledger of input/output tokens (from each response's
+    usage), per budget key: an entry point ("cli", "app") or a tenant id
+  - daily token budgets per key; each call reserves its estimated tokens
+    before it starts, and a call that would not fit in what is left (after
+    the calls already in flight) raises BudgetExceeded instead of spending
+    money
+  - token buckets for requests per minute and tokens per minute; callers
+    over the rate wait their turn (queue) instead of failing
+
+USAGE:
+    from budget import get_governor
+
+    message = get_governor().create(client, "cli", model=..., max_tokens=..., messages=...)
+    print(get_governor().remaining("cli"))
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from fsutil import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows: the ledger is still written atomically, just not locked across processes
+    fcntl = None
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+LEDGER_FILE = os.path.join("output", ".budget_ledger.json")
+
+# Daily budget in tokens (input + output) per key; "default" covers any other key
+DAILY_TOKEN_BUDGETS = {
+    "default": 1_000_000,
+    "cli": 2_000_000,
+    "app": 2_000_000,
+}
+
+# Client-side rate limits, kept a little under the account limits
+REQUESTS_PER_MINUTE = 40
+TOKENS_PER_MINUTE = 60_000
+
+# Days of history kept in the ledger
+LEDGER_RETENTION_DAYS = 31
+
+
+class BudgetExceeded(RuntimeError):
+    pass
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RATE LIMITER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """
+    Refills `rate` units per minute up to `rate`. acquire() blocks until the
+    units are available; waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.level = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.turn = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.rate, self.level + (now - self.updated) * self.rate / 60)
+        self.updated = now
+
+    def acquire(self, amount: float = 1):
+        # Requests bigger than the whole bucket would wait forever; cap them
+        amount = min(amount, self.rate)
+        with self.turn:
+            while True:
+                with self.lock:
+                    self._refill()
+                    if self.level >= amount:
+                        self.level -= amount
+                        return
+                    wait = (amount - self.level) * 60 / self.rate
+                time.sleep(wait)
+
+    def refund(self, amount: float):
+        with self.lock:
+            self._refill()
+            self.level = min(self.rate, self.level + amount)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LEDGER
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class Ledger:
+    """
+    {"YYYY-MM-DD": {key: {"input_tokens", "output_tokens", "requests"}}} in a
+    JSON file, updated under a file lock and replaced atomically.
+    """
+
+    def __init__(self, path: str = LEDGER_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self.lock, open(self.path + ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: dict):
+        days = sorted(data)[-LEDGER_RETENTION_DAYS:]
+        write_atomic(self.path, json.dumps({day: data[day] for day in days}, indent=1))
+
+    def used(self, key: str, day: str = None) -> int:
+        with self._locked():
+            row = self._read().get(day or _today(), {}).get(key, {})
+        return row.get("input_tokens", 0) + row.get("output_tokens", 0)
+
+    def record(self, key: str, input_tokens: int, output_tokens: int):
+        with self._locked():
+            data = self._read()
+            row = data.setdefault(_today(), {}).setdefault(
+                key, {"input_tokens": 0, "output_tokens": 0, "requests": 0}
+            )
+            row["input_tokens"] += input_tokens
+            row["output_tokens"] += output_tokens
+            row["requests"] += 1
+            self._write(data)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GOVERNOR
+# ─────────────────────────────────────────────────────────────────────────────
+
+def usage_tokens(usage) -> tuple:
+    """
+    (input, output) tokens from a response's usage, counting cached prompt reads and writes as input.
+    """
+    input_tokens = (
+        (getattr(usage, "input_tokens", 0) or 0)
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+    )
+    return input_tokens, getattr(usage, "output_tokens", 0) or 0
+
+
+def estimate_tokens(kwargs: dict) -> int:
+    """
+    Rough upper bound for a request before we know its usage:
+    about 4 characters per input token, plus the full max_tokens.
+    """
+    chars = len(json.dumps(kwargs.get("system", ""))) + len(json.dumps(kwargs.get("messages", [])))
+    return chars // 4 + kwargs.get("max_tokens", 0)
+
+
+class Governor:
+    """
+    Every call goes acquire() -> the request -> record() (with its usage)
+    or release() (failed before any usage was known).
+    """
+
+    def __init__(self, ledger: Ledger = None):
+        self.ledger = ledger or Ledger()
+        self.requests = TokenBucket(REQUESTS_PER_MINUTE)
+        self.tokens = TokenBucket(TOKENS_PER_MINUTE)
+        self.lock = threading.Lock()
+        # Estimated tokens of the calls in flight in this process, per key
+        self.reserved = {}
+
+    def budget(self, key: str) -> int:
+        return DAILY_TOKEN_BUDGETS.get(key, DAILY_TOKEN_BUDGETS["default"])
+
+    def remaining(self, key: str) -> int:
+        """
+        Tokens left today for `key`, not counting what calls in flight have reserved.
+        """
+        with self.lock:
+            return max(self.budget(key) - self.ledger.used(key) - self.reserved.get(key, 0), 0)
+
+    def acquire(self, key: str, estimated: int):
+        """
+        Reserve `estimated` tokens of the daily budget, then wait for the rate
+        limiters. Raises BudgetExceeded if the call does not fit in what is left.
+        """
+        with self.lock:
+            left = self.budget(key) - self.ledger.used(key) - self.reserved.get(key, 0)
+            if left < estimated:
+                raise BudgetExceeded(
+                    f"Daily token budget for '{key}' is used up: {max(left, 0):,} of "
+                    f"{self.budget(key):,} tokens left, this call needs up to {estimated:,}. "
+                    "It resets at midnight UTC."
+                )
+            self.reserved[key] = self.reserved.get(key, 0) + estimated
+        self.requests.acquire()
+        self.tokens.acquire(estimated)
+
+    def _unreserve(self, key: str, estimated: int):
+        with self.lock:
+            left = self.reserved.get(key, 0) - estimated
+            if left > 0:
+                self.reserved[key] = left
+            else:
+                self.reserved.pop(key, None)
+
+    def record(self, key: str, estimated: int, usage):
+        """
+        Settle a finished (or cancelled) call: its real usage goes into the
+        ledger and replaces its reservation.
+        """
+        input_tokens, output_tokens = usage_tokens(usage)
+        # Give back what we reserved but did not use
+        self.tokens.refund(max(estimated - input_tokens - output_tokens, 0))
+        self.ledger.record(key, input_tokens, output_tokens)
+        self._unreserve(key, estimated)
+
+    def release(self, key: str, estimated: int):
+        """
+        Give back the whole reservation of a call that failed without usage.
+        """
+        self.tokens.refund(estimated)
+        self._unreserve(key, estimated)
+
+    def create(self, client, key: str, **kwargs):
+        """
+        client.messages.create(**kwargs) under the budget and rate limits.
+        """
+        estimated = estimate_tokens(kwargs)
+        self.acquire(key, estimated)
+        try:
+            message = client.messages.create(**kwargs)
+        except Exception:
+            self.release(key, estimated)
+            raise
+        self.record(key, estimated, message.usage)
+        return message
+
+    async def create_async(self, client, key: str, **kwargs):
+        """
+        Async version for AsyncAnthropic; waiting happens in a worker thread.
+        """
+        import asyncio
+
+        estimated = estimate_tokens(kwargs)
+        await asyncio.to_thread(self.acquire, key, estimated)
+        try:
+            message = await client.messages.create(**kwargs)
+        except BaseException:
+            self.release(key, estimated)
+            raise
+        await asyncio.to_thread(self.record, key, estimated, message.usage)
+        return message
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> Governor:
+    """
+    Process-wide Governor, created on first use.
+    """
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = Governor()
+        return _governor
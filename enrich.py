@@ -0,0 +1,302 @@
+"""
+Miss AI – X Growth Architect | Full-article enrichment
+=====================================================
+The feed summary (400 characters) is often too thin for the biggest
+stories. This stage downloads the article page for only the top-K ranked
+items, pulls out the main text with a small readability-style extractor
+(stdlib html.parser, no extra dependencies) and keeps a key-facts excerpt
+within a per-item token cap.
+
+The page's og:image is kept too, as an image candidate for media.py.
+
+Results are cached on disk by URL (ENRICH_CACHE_DIR), so a story is
+downloaded and extracted once across all runs and tenants. Concurrent
+requests for the same URL (tenants sharing the default feeds) wait for the
+one download already in flight.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from fsutil import write_atomic
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# How many of the top-ranked items get their full article fetched
+ENRICH_TOP_K = 8
+
+# Maximum size of the key-facts excerpt per item (approx. 4 characters per token)
+EXCERPT_TOKEN_CAP = 250
+
+# Article pages fetched at once, and per-page timeout (seconds)
+ENRICH_CONCURRENCY = 8
+ENRICH_TIMEOUT = 10
+
+# Pages bigger than this are cut off before parsing
+MAX_PAGE_BYTES = 2_000_000
+
+ENRICH_CACHE_DIR = os.path.join("output", ".cache", "articles")
+
+# Failed downloads are cached too, but retried after this long (seconds)
+FAILED_RETRY_SECONDS = 6 * 3600
+
+# ─────────────────────────────────────────────────────────────────────────────
+# EXTRACTION
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure", "svg", "button"}
+_BLOCK_TAGS = {"p", "li", "h2", "h3", "blockquote"}
+_BOILERPLATE_RE = re.compile(
+    r"(subscribe|sign up|newsletter|cookie|all rights reserved|advertisement|read more|follow us)",
+    re.IGNORECASE,
+)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+_WHITESPACE_RE = re.compile(r"\s+")
+_HEADER_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w.:-]+)""", re.IGNORECASE)
+
+# URL -> Future of the download in flight, shared by everyone asking for that URL
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+class _ParagraphParser(HTMLParser):
+    """
+    Collects text blocks (paragraphs, list items, sub-headings) outside of
+    navigation, scripts and other page chrome, plus the <article> flag for each,
+    and the og:image (or twitter:image) URL.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.image = ""
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.block = None
+        self.blocks = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta" and not self.image:
+            attrs = dict(attrs)
+            if (attrs.get("property") or attrs.get("name")) in ("og:image", "twitter:image"):
+                self.image = (attrs.get("content") or "").strip()
+        elif tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag in _BLOCK_TAGS and not self.skip_depth:
+            self.block = []
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag == "article" and self.article_depth:
+            self.article_depth -= 1
+        elif tag in _BLOCK_TAGS and self.block is not None:
+            text = _WHITESPACE_RE.sub(" ", "".join(self.block)).strip()
+            if text:
+                self.blocks.append((text, self.article_depth > 0))
+            self.block = None
+
+    def handle_data(self, data):
+        if self.block is not None and not self.skip_depth:
+            self.block.append(data)
+
+
+def extract_main_text(html: str) -> str:
+    """
+    Main article text: paragraphs inside <article> if there are any, otherwise
+    every paragraph that looks like prose (long enough, not boilerplate).
+    """
+    return extract_page(html)[0]
+
+
+def extract_page(html: str) -> tuple:
+    """
+    (main text, og:image URL or "") for an article page; see extract_main_text.
+    """
+    parser = _ParagraphParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+
+    blocks = parser.blocks
+    if any(in_article for _, in_article in blocks):
+        blocks = [b for b in blocks if b[1]]
+    paragraphs = [
+        text for text, _ in blocks
+        if len(text) >= 60 and not _BOILERPLATE_RE.search(text)
+    ]
+    return "\n".join(paragraphs), parser.image
+
+
+def _fact_score(sentence: str, position: int) -> float:
+    """
+    Sentences with numbers, money, percentages, names and quotes carry the facts;
+    earlier sentences carry the lede.
+    """
+    score = 0.0
+    score += 2.0 * len(re.findall(r"\d", sentence)) ** 0.5
+    score += 1.5 if re.search(r"[$€£%]|\b(million|billion|percent)\b", sentence, re.IGNORECASE) else 0.0
+    score += 0.3 * len(re.findall(r"\b[A-Z][a-z]+", sentence[1:]))
+    score += 1.0 if '"' in sentence or "“" in sentence else 0.0
+    return score + 3.0 / (1 + position)
+
+
+def key_facts(text: str, token_cap: int = EXCERPT_TOKEN_CAP) -> str:
+    """
+    The most fact-dense sentences of `text`, in their original order, within `token_cap`.
+    """
+    sentences = [s.strip() for s in _SENTENCE_RE.split(text) if 25 <= len(s.strip()) <= 400]
+    ranked = sorted(range(len(sentences)), key=lambda i: _fact_score(sentences[i], i), reverse=True)
+
+    budget = token_cap * 4
+    chosen = []
+    for i in ranked:
+        if len(sentences[i]) + 1 > budget:
+            continue
+        chosen.append(i)
+        budget -= len(sentences[i]) + 1
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FETCH + CACHE
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _cache_path(url: str) -> str:
+    return os.path.join(ENRICH_CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+
+def _read_cache(url: str) -> dict:
+    try:
+        with open(_cache_path(url)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(url: str, entry: dict):
+    """
+    Best effort: the entry is already in hand, so a cache that cannot be
+    written only costs a download next time.
+    """
+    try:
+        write_atomic(_cache_path(url), json.dumps(entry))
+    except OSError:
+        pass
+
+
+def page_encoding(content_type: str, raw: bytes) -> str:
+    """
+    The charset of an HTML page: from the Content-Type header, else from
+    a <meta charset> / http-equiv tag near the top, else UTF-8.
+    (requests falls back to ISO-8859-1 for text/html without a header
+    charset, which garbles UTF-8 pages.)
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    match = _HEADER_CHARSET_RE.search(content_type or "")
+    declared = match.group(1) if match else None
+    if not declared:
+        meta = _META_CHARSET_RE.search(raw[:4096])
+        declared = meta.group(1).decode("ascii", "ignore") if meta else None
+    try:
+        return codecs.lookup(declared).name if declared else "utf-8"
+    except LookupError:
+        return "utf-8"
+
+
+def _fresh_cache(url: str) -> dict:
+    cached = _read_cache(url)
+    if cached is not None and (cached["text"] or time.time() - cached.get("fetched_at", 0) < FAILED_RETRY_SECONDS):
+        return cached
+    return None
+
+
+def fetch_article(url: str, session=None) -> dict:
+    """
+    {"url", "text", "excerpt", "image"} for one article page, from the cache when possible.
+    Failed downloads are cached too (empty text), so dead links are not retried every run.
+    If another thread is already downloading `url`, waits for its result instead.
+    """
+    cached = _fresh_cache(url)
+    if cached is not None:
+        return cached
+
+    with _in_flight_lock:
+        future = _in_flight.get(url)
+        owner = future is None
+        if owner:
+            future = _in_flight[url] = Future()
+    if not owner:
+        return dict(future.result())
+
+    try:
+        # The download we were about to wait for may have finished just before
+        entry = _fresh_cache(url) or _download(url, session)
+        future.set_result(entry)
+        return entry
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(url, None)
+
+
+def _download(url: str, session=None) -> dict:
+    import requests
+
+    from main import FEED_USER_AGENT
+
+    text = image = ""
+    try:
+        resp = (session or requests).get(
+            url, timeout=ENRICH_TIMEOUT, headers={"User-Agent": FEED_USER_AGENT}, stream=True
+        )
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "html")
+        if "html" in content_type:
+            raw = resp.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            text, image = extract_page(raw.decode(page_encoding(content_type, raw), errors="replace"))
+            image = urljoin(resp.url or url, image) if image else ""
+        resp.close()
+    except Exception:
+        text = image = ""
+
+    entry = {"url": url, "text": text, "excerpt": key_facts(text), "image": image, "fetched_at": time.time()}
+    _write_cache(url, entry)
+    return entry
+
+
+def enrich_items(items: list, top_k: int = ENRICH_TOP_K, session=None) -> list:
+    """
+    Add an "excerpt" (key facts from the full article) to the first `top_k`
+    items, which are the top-ranked ones. Pages are fetched concurrently.
+    Returns the same list.
+    """
+    targets = [item for item in items[:top_k] if item.get("link")]
+    if not targets:
+        return items
+
+    from profiling import inherit
+
+    with ThreadPoolExecutor(max_workers=min(len(targets), ENRICH_CONCURRENCY)) as pool:
+        # inherit: the downloads show up in a profiled app job's profile
+        entries = pool.map(inherit(lambda item: fetch_article(item["link"], session)), targets)
+        for item, entry in zip(targets, entries):
+            if entry["excerpt"]:
+                item["excerpt"] = entry["excerpt"]
+    return items
@@ -0,0 +1,35 @@
+"""
+Miss AI – X Growth Architect | File helpers
+==========================================
+Shared by the on-disk caches, indexes and stores: readers must never see a
+half-written file, and concurrent writers (threads, tenants, processes)
+must never trip over each other's temporary files.
+"""
+
+import os
+import tempfile
+
+
+def write_atomic(path: str, data):
+    """
+    Replace `path` with `data` (bytes, or str written as UTF-8) in one step.
+
+    The data goes to a uniquely named temporary file in the same directory,
+    which is then renamed over `path`, so concurrent writers of the same
+    path each get their own temporary file and the last rename wins.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
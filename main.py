@@ -23,18 +23,43 @@ HOW TO RUN:
        Or skip the menu by passing a topic directly:
            python3 main.py "OpenAI just released a new model"
 
+       Generate several variants and keep the best posts (see variants.py):
+           python3 main.py --variants 4 "OpenAI just released a new model"
+
+       Run every brand in tenants.json from one shared fetch (see tenants.py):
+           python3 main.py --tenants tenants.json
+
+       Ground the suggested posting times in your own X analytics (see analytics.py):
+           python3 analytics.py import account_analytics.csv
+
 OUTPUT:
-    A markdown file is saved to ./output/ with a timestamp in the filename.
+    Packages are appended to the package store in ./output/store/ (see
+    store.py). Export them as markdown files in ./output/ when needed:
+           python3 main.py --export              # latest package
+           python3 main.py --export all
+    Images for the stories it is anchored on are saved to ./media/ and
+    listed in its MEDIA section (see media.py).
+
+STARTUP:
+    n8n and cron cold-start this script on every run, so heavy modules
+    (anthropic, feedparser, requests) are imported inside the functions that
+    use them. The manual-topic path never loads the RSS stack.
+    It is still far from the interpreter's own startup (~15 ms): about
+    1.5 s passes from launch to the API request, and ~1.2 s of that is
+    importing the anthropic SDK, whose streaming client the hedging,
+    fallback and budget code (resilience.py) is built on. The interactive
+    menu hides the import by starting it while you type.
+    Measure with:  python3 bench.py startup
+
+PROFILING:
+    python3 main.py --profile [...] samples every thread's stack and tracks
+    allocations for the whole run; see profiling.py for the output files.
 """
 
 import os
 import sys
 import re
-from datetime import datetime, timedelta
-
-import anthropic
-import feedparser
-import requests
+from datetime import datetime, timedelta, timezone
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CONFIGURATION
@@ -75,11 +100,23 @@ NEWS_RSS_FEEDS = [
 # Maximum articles to keep from the last 24 hours
 MAX_ITEMS = 60
 
+# Safety cap on entries read from one feed. Feeds are read until the cutoff,
+# not a fixed count, so busy feeds keep all of their recent items.
+MAX_ENTRIES_PER_FEED = 500
+
+# HTML cleanup for feed summaries, compiled once at import
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_IMG_SRC_RE = re.compile(r"""<img[^>]+src=["']([^"']+)["']""", re.IGNORECASE)
+
+# Sent with every feed request; some feeds block the default client UA
+FEED_USER_AGENT = "Mozilla/5.0 (compatible; MissAI-RSS/1.0)"
+
 # ─────────────────────────────────────────────────────────────────────────────
 # PROMPT (Miss AI brand voice + news-anchored content)
 # ─────────────────────────────────────────────────────────────────────────────
 
-SYSTEM_PROMPT = """You are "Miss AI – X Growth Architect", the X (Twitter) alter ego of Keira Nesdale.
+BRAND_VOICE_PROMPT = """You are "Miss AI – X Growth Architect", the X (Twitter) alter ego of Keira Nesdale.
 
 IDENTITY AND POSITIONING:
 You are Keira Nesdale operating as "Miss AI". You speak in first person.
@@ -190,27 +227,41 @@ NON NEGOTIABLES:
 - Your unfair advantage (AI, content, podcasting, no code, venture perspective) should show up through examples and angles.
 - You are building Miss AI as a long term brand, not chasing cheap engagement.
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+# What the news covers and who the practical short post is for. Other brands
+# set their own in their tenant profile (see tenants.py).
+NEWS_CATEGORY = "AI, automation, startups, and small or medium businesses"
+TARGET_AUDIENCE = "SMB owners"
+
+# The Miss AI prompt's own wording for its audience and storyteller. Other
+# brands get their audience and name as-is.
+TARGET_AUDIENCE_HEADING = "SMB Owners"
+TARGET_READER = "an SMB owner"
+STORYTELLER = "Miss AI and Keira"
+
+OUTPUT_FORMAT_HEADER = """━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 OUTPUT FORMAT — return EXACTLY this structure. No preamble. No commentary outside the sections.
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
----
+"""
 
-## METADATA
-- **Main Pillar:** [one pillar from the list above]
+# Output format blocks in package order. METADATA and ENGAGEABILITY SCORE are
+# always included; the rest can be switched off per tenant (see tenants.py).
+# {brand}, {audience_heading}, {reader}, {storyteller} and {pillar} are filled
+# in per brand by build_system_prompt.
+OUTPUT_FORMAT_BLOCKS = {
+    "metadata": """## METADATA
+- **Main Pillar:** [{pillar}]
 - **Target Audience:** [one sentence: who this will resonate with most]
 - **Suggested Posting Times:** [two specific day + time + timezone combos, e.g. Tuesday 8am EST · Thursday 6pm EST]
-
----
-
-## ENGAGEABILITY SCORE
+""",
+    "engageability": """## ENGAGEABILITY SCORE
 **Score:** X/10
 **Why:** [2–3 sentences covering clarity, controversy, novelty, emotional impact, and why this is likely to go viral or at least perform above average on X.]
 When in doubt between a safe angle and a spicier but still honest angle, choose the spicier one that will drive more replies and quote tweets.
-
----
-
-## LONG POST (~1,000 characters)
+""",
+    "long_post": """## LONG POST (~1,000 characters)
 
 [Best hook line as opening line, no label]
 
@@ -219,10 +270,8 @@ When in doubt between a safe angle and a spicier but still honest angle, choose
 **Content Pillar:** [pillar]
 **CTA:** [cta]
 **Spiciness:** X/10 | **Technical Depth:** X/10
-
----
-
-## SHORT POST 1 – Funny or Meme Adjacent
+""",
+    "short_post_1": """## SHORT POST 1 – Funny or Meme Adjacent
 
 [Best hook line as opening line, no label]
 
@@ -231,34 +280,28 @@ When in doubt between a safe angle and a spicier but still honest angle, choose
 **Content Pillar:** [pillar]
 **CTA:** [cta]
 **Spiciness:** X/10 | **Technical Depth:** X/10
-
----
-
-## SHORT POST 2 – Practical Play for SMB Owners
+""",
+    "short_post_2": """## SHORT POST 2 – Practical Play for {audience_heading}
 
 [Best hook line as opening line, no label]
 
-[Remaining post body. The most tactical of the three. What should an SMB owner do differently because of this news or insight? Be specific: tool, step, timeline. Keep the entire post under 100 characters while still being clear.]
+[Remaining post body. The most tactical of the three. What should {reader} do differently because of this news or insight? Be specific: tool, step, timeline. Keep the entire post under 100 characters while still being clear.]
 
 **Content Pillar:** [pillar]
 **CTA:** [cta]
 **Spiciness:** X/10 | **Technical Depth:** X/10
-
----
-
-## SHORT POST 3 – Life Lesson and Mindset (Miss AI)
+""",
+    "short_post_3": """## SHORT POST 3 – Life Lesson and Mindset ({brand})
 
 [Best hook line as opening line, no label]
 
-[Remaining post body. Personal story from Miss AI and Keira’s perspective, compressed. Tie it to a lesson learned in the last 24 hours if provided by the user, and or to a current news event. Show what you learned and one clear takeaway, all in under 100 characters.]
+[Remaining post body. Personal story from {storyteller}’s perspective, compressed. Tie it to a lesson learned in the last 24 hours if provided by the user, and or to a current news event. Show what you learned and one clear takeaway, all in under 100 characters.]
 
 **Content Pillar:** [pillar]
 **CTA:** [cta]
 **Spiciness:** X/10 | **Technical Depth:** X/10
-
----
-
-## POLL
+""",
+    "poll": """## POLL
 
 **Question:** [juicy, debate worthy question based on a current topic in the input]
 
@@ -270,12 +313,64 @@ When in doubt between a safe angle and a spicier but still honest angle, choose
 **Content Pillar:** [pillar]
 **CTA:** [cta]
 **Spiciness:** X/10 | **Technical Depth:** X/10
-"""
+""",
+}
+
+ALWAYS_ON_OUTPUTS = ("metadata", "engageability")
+
+
+def build_system_prompt(
+    voice_prompt: str,
+    outputs: dict = None,
+    brand: str = "Miss AI",
+    audience: str = TARGET_AUDIENCE,
+    pillars: list = None,
+) -> str:
+    """
+    Combine a brand voice with the output format.
+    `outputs` maps block names (e.g. "poll") to False to leave them out.
+    `pillars` are the brand's content pillars; None means the voice prompt
+    lists them itself (as the Miss AI voice does).
+    """
+    outputs = outputs or {}
+    if pillars is None:
+        pillar = "one pillar from the list above"
+    elif pillars:
+        pillar = "one of: " + ", ".join(pillars)
+    else:
+        pillar = "the one content pillar this package is mostly about"
+    default_audience = audience == TARGET_AUDIENCE
+    fields = {
+        "brand": brand,
+        "audience_heading": TARGET_AUDIENCE_HEADING if default_audience else audience,
+        "reader": TARGET_READER if default_audience else audience,
+        "storyteller": STORYTELLER if brand == "Miss AI" else brand,
+        "pillar": pillar,
+    }
+    blocks = [
+        block.format_map(fields).rstrip("\n")
+        for name, block in OUTPUT_FORMAT_BLOCKS.items()
+        if name in ALWAYS_ON_OUTPUTS or outputs.get(name, True)
+    ]
+    return voice_prompt + OUTPUT_FORMAT_HEADER + "---\n\n" + "\n\n---\n\n".join(blocks) + "\n"
+
+
+SYSTEM_PROMPT = build_system_prompt(BRAND_VOICE_PROMPT)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CORE FUNCTIONS
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _prewarm_anthropic():
+    """
+    Import the anthropic SDK in a background thread while we wait on the user,
+    so the interactive paths do not pay for it after the input is typed.
+    """
+    import threading
+
+    threading.Thread(target=__import__, args=("anthropic",), daemon=True).start()
+
+
 def show_menu() -> str:
     """
     Simple mode-selection menu.
@@ -288,38 +383,61 @@ def show_menu() -> str:
     return input("Choice: ").strip()
 
 
-def _fetch_one_feed(url: str, max_items: int) -> list:
+def _fetch_one_feed(url: str, cutoff: datetime = None, session=None) -> list:
     """
-    Fetch a single RSS/Atom feed and return up to max_items article dicts.
+    Fetch a single RSS/Atom feed and return the article dicts published at or
+    after `cutoff` (all of them if None).
+    Pass a requests.Session to reuse connections across feeds and runs.
 
     Each dict:
-      title, summary, link, published_dt (datetime), source_url
+      title, summary, link, published (timezone-aware UTC datetime), source_url,
+      images (candidate image URLs from the entry, may be empty)
     """
+    import requests
+
     try:
-        resp = requests.get(
+        resp = (session or requests).get(
             url,
             timeout=10,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; MissAI-RSS/1.0)"},
+            headers={"User-Agent": FEED_USER_AGENT},
         )
         resp.raise_for_status()
-        parsed = feedparser.parse(resp.content)
+    except Exception:
+        return []
+
+    return parse_feed(resp.content, url, cutoff)
+
+
+def parse_feed(content: bytes, url: str, cutoff: datetime = None) -> list:
+    """
+    Parse a downloaded RSS/Atom document into article dicts (see _fetch_one_feed).
+    Shared by the sync fetcher and the async pipeline.
+    """
+    import calendar
+
+    import feedparser
+
+    try:
+        parsed = feedparser.parse(content)
     except Exception:
         return []
 
     articles = []
-    for entry in parsed.entries[:max_items]:
+    for entry in parsed.entries[:MAX_ENTRIES_PER_FEED]:
         title = (entry.get("title") or "").strip()
         if not title:
             continue
 
-        raw = entry.get("summary") or entry.get("description") or ""
-        summary = re.sub(r"<[^>]+>", " ", raw)
-        summary = re.sub(r"\s+", " ", summary).strip()[:400]
+        raw_summary = entry.get("summary") or entry.get("description") or ""
+        summary = clean_summary(raw_summary)
 
         published_struct = entry.get("published_parsed") or entry.get("updated_parsed")
         if not published_struct:
             continue
-        published_dt = datetime(*published_struct[:6])
+        # feedparser normalises to a UTC struct_time; timegm keeps it in UTC
+        published_dt = datetime.fromtimestamp(calendar.timegm(published_struct), tz=timezone.utc)
+        if cutoff and published_dt < cutoff:
+            continue
 
         link = (entry.get("link") or "").strip()
 
@@ -330,51 +448,148 @@ def _fetch_one_feed(url: str, max_items: int) -> list:
                 "link": link,
                 "published": published_dt,
                 "source_url": url,
+                "images": entry_images(entry, raw_summary),
             }
         )
 
     return articles
 
 
-def fetch_all_news_items(hours: int = 24, max_items: int = MAX_ITEMS) -> list:
+def entry_images(entry, raw_summary: str = "") -> list:
+    """
+    Image URLs a feed entry carries: media:content, media:thumbnail, image
+    enclosures, then <img> tags in the summary HTML. Deduplicated, in that order.
+    """
+    urls = []
+    for media in entry.get("media_content") or []:
+        if media.get("medium", "image") == "image" and media.get("type", "image/").startswith("image/"):
+            urls.append(media.get("url"))
+    urls += [thumb.get("url") for thumb in entry.get("media_thumbnail") or []]
+    urls += [
+        enclosure.get("href")
+        for enclosure in entry.get("enclosures") or []
+        if (enclosure.get("type") or "").startswith("image/")
+    ]
+    urls += _IMG_SRC_RE.findall(raw_summary)
+    return [url for url in dict.fromkeys(urls) if url and url.startswith("http")]
+
+
+def clean_summary(raw: str) -> str:
+    """
+    Strip HTML tags and whitespace runs, and cut to 400 characters.
+    """
+    summary = _TAG_RE.sub(" ", raw)
+    return _WHITESPACE_RE.sub(" ", summary).strip()[:400]
+
+
+def fetch_feed_items(hours: int = 24, feeds: list = None, session=None, sources: list = None) -> dict:
     """
-    Fetch news items from all NEWS_RSS_FEEDS in the last `hours`.
-    Returns a list of dicts: {title, summary, link, published}.
+    Fetch `feeds` (default: all NEWS_RSS_FEEDS) and any extra source adapters,
+    without deduplicating or ranking. Returns {feed url: [article dicts
+    published in the last `hours`]}.
     """
-    cutoff = datetime.utcnow() - timedelta(hours=hours)
-    all_items = []
+    feeds = feeds or NEWS_RSS_FEEDS
 
-    print(f"\nFetching news from {len(NEWS_RSS_FEEDS)} RSS feeds (last {hours} hours)...")
+    print(f"\nFetching news from {len(feeds)} RSS feeds (last {hours} hours)...")
 
-    for url in NEWS_RSS_FEEDS:
-        items = _fetch_one_feed(url, max_items=10)
-        count_before = len(all_items)
-        for item in items:
-            if item["published"] >= cutoff:
-                all_items.append(item)
-        count_after = len(all_items)
-        added = count_after - count_before
-        print(f"  {url[:50]}... → {added} recent items")
+    cutoff = window_cutoff(hours)
+    if sources:
+        from sources import RSSAdapter, fetch_from_sources
+
+        return fetch_from_sources([RSSAdapter(feeds, session=session)] + list(sources), cutoff)
+    return {url: _fetch_one_feed(url, cutoff=cutoff, session=session) for url in feeds}
 
-    if not all_items:
-        return []
 
-    all_items.sort(key=lambda x: x["published"], reverse=True)
-    return all_items[:max_items]
+def fetch_all_news_items(
+    hours: int = 24,
+    max_items: int = MAX_ITEMS,
+    feeds: list = None,
+    session=None,
+    sources: list = None,
+    window=None,
+) -> list:
+    """
+    Fetch news items from `feeds` (default: all NEWS_RSS_FEEDS) in the last `hours`.
+    Returns a deduplicated list of dicts: {title, summary, link, published, source_url}.
+    Pass max_items=None to keep every recent item.
 
+    `sources` are extra source adapters (see sources.py, e.g. Reddit/X via Apify).
+    They run alongside the RSS feeds and share the same window and ranking.
 
-def generate_content(news_bundle: str) -> str:
+    Pass a long-lived window.ArticleWindow to poll repeatedly: each fetch is
+    merged into it, and items older than its span are evicted.
     """
-    Send the combined news bundle to Claude and get the content package.
-    `news_bundle` is a text list of news items from the last 24h and optionally a daily lesson.
+    feed_items = fetch_feed_items(hours=hours, feeds=feeds, session=session, sources=sources)
+    return select_recent(feed_items, hours=hours, max_items=max_items, window=window)
+
+
+def window_cutoff(hours: int) -> datetime:
     """
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    Start of the news window as a timezone-aware UTC datetime.
+    """
+    return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def select_recent(
+    feed_items: dict,
+    hours: int = 24,
+    max_items: int = MAX_ITEMS,
+    window=None,
+    verbose: bool = True,
+) -> list:
+    """
+    Keep the items from {feed url: [article dicts]} published in the last `hours`,
+    deduplicated (freshest copy of a repeated story wins) and ranked best first
+    (see ranking.py). Shared by the sync and async fetchers.
 
-    user_message = (
+    `window` is an existing window.ArticleWindow to merge into; by default a
+    new one spanning `hours` is used for this call only.
+    """
+    from ranking import rank_items
+    from window import ArticleWindow
+
+    window = window if window is not None else ArticleWindow(hours)
+    for url, items in feed_items.items():
+        recent = window.extend(url, items)
+        if verbose:
+            print(f"  {url[:50]}... → {recent} recent items")
+
+    all_items = window.items()
+    if not all_items:
+        return []
+    return rank_items(all_items, max_items=max_items)
+
+
+def build_news_bundle(items: list, heading: str = "NEWS – LAST 24 HOURS (ALL FEEDS):") -> str:
+    """
+    Turn article dicts into the text bundle sent to Claude.
+    """
+    lines = []
+    for item in items:
+        line = f"- Title: {item['title']}\n  Summary: {item['summary']}\n"
+        if item.get("excerpt"):
+            line += f"  Key Facts: {item['excerpt']}\n"
+        lines.append(line + f"  Source Link: {item['link']}")
+    return f"{heading}\n\n" + "\n\n".join(lines)
+
+
+def build_user_message(
+    news_bundle: str,
+    brand: str = "Miss AI",
+    category: str = NEWS_CATEGORY,
+    audience: str = TARGET_AUDIENCE,
+) -> str:
+    """
+    Wrap the news bundle in the task instructions for one content package.
+    """
+    practical_post = (
+        "SMB play short post" if audience == TARGET_AUDIENCE else f"play short post for {audience}"
+    )
+    return (
         "You will receive a bundle of news items from the last 24 hours.\n"
-        "- Each item has a title, summary, and link.\n"
-        "- They cover AI, automation, startups, and small or medium businesses.\n"
-        "- The bundle may also include a short note like 'Lesson I learned today' from Miss AI.\n\n"
+        "- Each item has a title, summary, and link. The top stories also have Key Facts from the full article.\n"
+        f"- They cover {category}.\n"
+        f"- The bundle may also include a short note like 'Lesson I learned today' from {brand}.\n\n"
         "Your job:\n"
         "1) Scan ALL items and group them into topics and themes.\n"
         "2) Use frequency (how many articles mention a theme) as a proxy for importance.\n"
@@ -384,58 +599,201 @@ def generate_content(news_bundle: str) -> str:
         "4) Choose themes for:\n"
         "   - One long news and opinion post.\n"
         "   - One funny or meme adjacent short post.\n"
-        "   - One very practical SMB play short post.\n"
-        "   - One life lesson and mindset short post from Miss AI.\n"
+        f"   - One very practical {practical_post}.\n"
+        f"   - One life lesson and mindset short post from {brand}.\n"
         "   - One juicy, controversial poll.\n"
-        "5) Make sure everything is written in Miss AI voice as defined in the system prompt.\n"
+        f"5) Make sure everything is written in {brand} voice as defined in the system prompt.\n"
         "6) Optimise every post for high engagement and virality while staying honest and useful.\n"
-        "7) Generate the X content package only around those chosen themes.\n\n"
+        "7) Generate the X content package only around those chosen themes,\n"
+        "   and only the sections listed in the output format.\n\n"
         "Here is the news bundle and any daily lesson info:\n\n"
         f"{news_bundle}\n\n"
         "Follow the output format exactly."
     )
 
-    print("\nGenerating content from news bundle...")
-    print("Calling Claude API — this takes about 15–30 seconds...\n")
 
-    message = client.messages.create(
-        model=MODEL,
+def generate_content(
+    news_bundle: str,
+    verbose: bool = True,
+    system_prompt: str = SYSTEM_PROMPT,
+    brand: str = "Miss AI",
+    budget_key: str = "cli",
+    category: str = NEWS_CATEGORY,
+    audience: str = TARGET_AUDIENCE,
+) -> str:
+    """
+    Send the combined news bundle to Claude and get the content package.
+    `news_bundle` is a text list of news items from the last 24h and optionally a daily lesson.
+    `brand`, `category` and `audience` describe who it is written for (see build_user_message).
+
+    The system prompt is marked for prompt caching, so repeated runs (variants,
+    tenants, reruns within a few minutes) only pay full price for it once per brand.
+    The call goes through the token budget governor under `budget_key` (see budget.py)
+    and is hedged / falls back to other models when slow or overloaded (see resilience.py).
+    """
+    import anthropic
+
+    from resilience import cascade_for, generate_resilient
+
+    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    user_message = build_user_message(news_bundle, brand, category, audience)
+
+    if verbose:
+        print("\nGenerating content from news bundle...")
+        print("Calling Claude API — this takes about 15–30 seconds...\n")
+
+    return generate_resilient(
+        client,
+        budget_key,
+        models=cascade_for(MODEL),
         max_tokens=4096,
-        system=SYSTEM_PROMPT,
+        system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
         messages=[{"role": "user", "content": user_message}],
     )
 
-    return message.content[0].text
 
-
-def save_to_markdown(context_title: str, content: str) -> str:
+def save_to_markdown(context_title: str, content: str, tenant_id: str = "", brand: str = "Miss AI") -> str:
     """
-    Write the generated content to a timestamped markdown file in OUTPUT_DIR.
+    Append the generated package to the package store (see store.py) and
+    return its id. The markdown file is written on demand by export_packages.
     """
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    from store import get_store
 
-    safe_topic = "".join(c if c.isalnum() or c in " -_" else "" for c in context_title)
-    safe_topic = safe_topic[:40].strip().replace(" ", "_") or "News"
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{OUTPUT_DIR}/{timestamp}_{safe_topic}.md"
+    return get_store().append(context_title, content, tenant_id=tenant_id, brand=brand)
 
-    header = (
-        f"# Miss AI – Content Package\n\n"
-        f"**Context:** {context_title}  \n"
-        f"**Generated:** {datetime.now().strftime('%B %d, %Y at %H:%M')}\n\n"
-        f"---\n\n"
-    )
 
-    with open(filename, "w") as f:
-        f.write(header + content)
+def export_packages(which: str = "latest") -> list:
+    """
+    Export stored packages as markdown files: "latest", "all", or an id (prefix).
+    Returns the file paths.
+    """
+    from store import get_store
 
-    return filename
+    store = get_store()
+    entries = store.packages()
+    if which == "latest":
+        entries = entries[-1:]
+    elif which != "all":
+        entries = [entry for entry in entries if entry["id"].startswith(which)]
+    return [store.export(entry["id"]) for entry in entries]
 
 # ─────────────────────────────────────────────────────────────────────────────
 # ENTRY POINT
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Defaults for every CLI option, shared by argparse and the fast path below
+CLI_DEFAULTS = {
+    "topic": [],
+    "variants": 1,
+    "tenants": None,
+    "due": False,
+    "use_async": False,
+    "sources": None,
+    "enrich": True,
+    "media": True,
+    "export": None,
+    "profile": False,
+}
+
+
+def parse_args(argv: list = None):
+    """
+    Parse CLI options. A plain `main.py "topic"` (no flags) skips loading
+    argparse, which is a noticeable share of a cold start.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not any(arg.startswith("-") for arg in argv):
+        from types import SimpleNamespace
+
+        return SimpleNamespace(**dict(CLI_DEFAULTS, topic=argv))
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Miss AI – X Growth Architect")
+    parser.set_defaults(**CLI_DEFAULTS)
+    parser.add_argument("topic", nargs="*", help="skip the menu and generate from this topic")
+    parser.add_argument(
+        "--variants",
+        type=int,
+        metavar="N",
+        help="generate N variants concurrently and keep the best scoring posts",
+    )
+    parser.add_argument(
+        "--tenants",
+        nargs="?",
+        const="tenants.json",
+        metavar="FILE",
+        help="run every tenant profile in FILE (default tenants.json) from one shared fetch",
+    )
+    parser.add_argument(
+        "--due",
+        action="store_true",
+        help="with --tenants: only run tenants scheduled for the current hour",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="fetch feeds concurrently and call Claude through the async pipeline",
+    )
+    parser.add_argument(
+        "--sources",
+        metavar="FILE",
+        help="JSON list of extra source adapters (Reddit/X via Apify) to search alongside RSS",
+    )
+    parser.add_argument(
+        "--no-enrich",
+        dest="enrich",
+        action="store_false",
+        help="skip fetching full articles for the top-ranked stories",
+    )
+    parser.add_argument(
+        "--no-media",
+        dest="media",
+        action="store_false",
+        help="skip collecting images for the anchor stories",
+    )
+    parser.add_argument(
+        "--export",
+        nargs="?",
+        const="latest",
+        metavar="ID",
+        help="export stored packages as markdown: latest (default), all, or a package id",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile the run (collapsed stacks + allocation summary in output/profiles/)",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
+    args = parse_args()
+
+    # python main.py --profile ...: sampling profiler + tracemalloc around the whole run
+    if args.profile:
+        from profiling import Profiler
+
+        with Profiler():
+            _run(args)
+    else:
+        _run(args)
+
+
+def _run(args):
+    """
+    One CLI run for the parsed `args`.
+    """
+    # Markdown export from the package store: python main.py --export [ID|all]
+    if args.export:
+        paths = export_packages(args.export)
+        for path in paths:
+            print(f"  {path}")
+        if not paths:
+            print(f"No stored packages match '{args.export}'.")
+        return
+
     # API key check
     if not ANTHROPIC_API_KEY:
         print("\nERROR: No Anthropic API key found.")
@@ -444,9 +802,22 @@ def main():
         print("Get your key at: https://console.anthropic.com/\n")
         sys.exit(1)
 
+    # Multi-brand run: python main.py --tenants tenants.json
+    if args.tenants:
+        from budget import get_governor
+        from tenants import load_tenants, run_tenants
+
+        tenants = load_tenants(args.tenants)
+        for tenant_id, result in run_tenants(tenants, due_only=args.due).items():
+            print(f"  {tenant_id}: {result} (budget left today: {get_governor().remaining(tenant_id):,})")
+        return
+
+    # News items behind the bundle (none for a manual topic)
+    items = []
+
     # CLI shortcut: python main.py "some topic"
-    if len(sys.argv) > 1:
-        manual_topic = " ".join(sys.argv[1:]).strip()
+    if args.topic:
+        manual_topic = " ".join(args.topic).strip()
         if not manual_topic:
             print("No topic provided. Exiting.")
             sys.exit(1)
@@ -454,6 +825,7 @@ def main():
         context_title = manual_topic[:80]
 
     else:
+        _prewarm_anthropic()
         choice = show_menu()
 
         if choice == "0":
@@ -469,28 +841,37 @@ def main():
             context_title = manual_topic[:80]
 
         elif choice == "1":
-            items = fetch_all_news_items(hours=24, max_items=MAX_ITEMS)
+            sources = None
+            if args.sources:
+                from sources import load_sources
+
+                sources = load_sources(args.sources)
+            if args.use_async:
+                import asyncio
+                from async_pipeline import fetch_all_news_items_async
+
+                items = asyncio.run(fetch_all_news_items_async(hours=24, max_items=MAX_ITEMS, sources=sources))
+            else:
+                items = fetch_all_news_items(hours=24, max_items=MAX_ITEMS, sources=sources)
             if not items:
                 print("\nNo recent news items found in the last 24 hours.")
                 sys.exit(1)
 
-            print("\nUsing latest mixed news items (showing first 10):")
+            print("\nUsing top-ranked mixed news items (showing first 10):")
             for item in items[:10]:
                 print(f"- {item['title']} ({item['published']:%Y-%m-%d %H:%M})")
             print()
 
+            if args.enrich:
+                from enrich import ENRICH_TOP_K, enrich_items
+
+                print(f"Fetching full articles for the top {ENRICH_TOP_K} stories...")
+                enrich_items(items)
+
             # Optional: future daily lesson
             # daily_lesson = input("Optional: type one lesson you learned today (or leave blank): ").strip()
 
-            lines = []
-            for item in items:
-                lines.append(
-                    f"- Title: {item['title']}\n"
-                    f"  Summary: {item['summary']}\n"
-                    f"  Source Link: {item['link']}"
-                )
-
-            news_bundle = "NEWS – LAST 24 HOURS (ALL FEEDS):\n\n" + "\n\n".join(lines)
+            news_bundle = build_news_bundle(items)
 
             # if daily_lesson:
             #     news_bundle += f"\n\nLESSON_I_LEARNED_TODAY:\n{daily_lesson}\n"
@@ -502,15 +883,52 @@ def main():
             sys.exit(1)
 
     # Generate
-    content = generate_content(news_bundle)
+    from budget import BudgetExceeded, get_governor
+
+    try:
+        content = _generate(args, news_bundle)
+    except BudgetExceeded as e:
+        print(f"\n{e}")
+        sys.exit(1)
+
+    from analytics import fill_posting_times
+
+    content = fill_posting_times(content)
+
+    if items and args.media:
+        from media import attach_media
+
+        print("Collecting images for the anchor stories...")
+        content = attach_media(content, items)
 
     # Save
-    output_file = save_to_markdown(context_title, content)
+    package_id = save_to_markdown(context_title, content)
 
-    print(f"Done! Full content package saved to:\n  {output_file}\n")
+    print(f"Done! Full content package saved as {package_id}")
+    print(f"Export it as markdown with:  python3 main.py --export {package_id}\n")
     print("── PREVIEW (first 600 chars) " + "─" * 40)
     print(content[:600])
-    print("\n[...open the file for the full package]")
+    print("\n[...export the package for the full text]")
+    print(f"\nToken budget left today (cli): {get_governor().remaining('cli'):,}")
+
+
+def _generate(args, news_bundle: str) -> str:
+    """
+    Single call, best-of-N variants, or the async client, depending on the CLI flags.
+    """
+    if args.variants > 1:
+        from variants import generate_best_of_n
+
+        print(f"\nGenerating {args.variants} variants and keeping the best posts...")
+        return generate_best_of_n(
+            lambda bundle: generate_content(bundle, verbose=False), news_bundle, args.variants
+        )
+    elif args.use_async:
+        import asyncio
+        from async_pipeline import generate_content_async
+
+        return asyncio.run(generate_content_async(news_bundle))
+    return generate_content(news_bundle)
 
 if __name__ == "__main__":
     main()
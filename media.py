@@ -0,0 +1,289 @@
+"""
+Miss AI – X Growth Architect | Media for the anchor stories
+==========================================================
+Collects images for the stories a package is anchored on, so the posting
+step has them on disk and never downloads them again.
+
+  - candidates: the feed entry's media:content / thumbnails / enclosures
+    (see main.entry_images) plus the article page's og:image (enrich.py)
+  - downloads run concurrently, capped at MAX_IMAGE_BYTES each; tiny images
+    (icons, tracking pixels) are dropped
+  - near-duplicates (the same photo at another size or crop) are dropped by
+    perceptual hash (dHash)
+  - each image is resized to a thumbnail and stored content-addressed in
+    MEDIA_DIR, next to output/, so the same image is stored only once
+
+The saved package gets a MEDIA section with the local paths.
+
+Pillow is optional: without it images are stored as downloaded, and
+deduplicated by exact content only.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fsutil import write_atomic
+
+try:
+    from PIL import Image
+except ImportError:  # optional; images are then kept as downloaded
+    Image = None
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Content-addressed image store, next to output/
+MEDIA_DIR = "media"
+
+# Stories per package to collect images for, and images kept per package
+MEDIA_ANCHORS = 3
+MAX_IMAGES = 4
+
+# Downloads in flight at once, per-image timeout (seconds) and size cap
+MEDIA_CONCURRENCY = 8
+MEDIA_TIMEOUT = 15
+MAX_IMAGE_BYTES = 8_000_000
+
+# Images with a shorter side than this are icons or pixels, not post images
+MIN_IMAGE_SIDE = 200
+
+# Thumbnails: longest side in pixels and JPEG quality
+THUMBNAIL_MAX_SIDE = 1200
+THUMBNAIL_QUALITY = 85
+
+# Perceptual hashes this many bits apart (of 64) count as the same image
+PHASH_DISTANCE = 6
+
+# Failed downloads are retried after this long (seconds)
+FAILED_RETRY_SECONDS = 6 * 3600
+
+_URL_RE = re.compile(r"https?://[^\s|)\]>]+")
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ANCHORS + CANDIDATES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def anchor_items(content: str, items: list, limit: int = MEDIA_ANCHORS) -> list:
+    """
+    The items whose links the package cites (in order of first mention),
+    or the top-ranked items if it cites none of them.
+    """
+    by_link = {item["link"].rstrip("/"): item for item in items if item.get("link")}
+    anchors = []
+    for url in _URL_RE.findall(content):
+        item = by_link.get(url.rstrip(".,;:/"))
+        if item is not None and item not in anchors:
+            anchors.append(item)
+    return (anchors or items)[:limit]
+
+
+def candidate_images(item: dict, session=None) -> list:
+    """
+    Image URLs for one story: the feed's own media first, then the page's og:image.
+    """
+    from enrich import fetch_article
+
+    urls = list(item.get("images") or [])
+    if item.get("link"):
+        urls.append(fetch_article(item["link"], session).get("image", ""))
+    return [url for url in dict.fromkeys(urls) if url]
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DOWNLOAD + THUMBNAILS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def dhash(image, size: int = 8) -> int:
+    """
+    64-bit difference hash: which neighbouring pixels get brighter, on a tiny greyscale copy.
+    """
+    small = image.convert("L").resize((size + 1, size))
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            bits = (bits << 1) | (left > pixels[row * (size + 1) + col + 1])
+    return bits
+
+
+def _hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _download(url: str, session=None) -> tuple:
+    """
+    (bytes, content type) of an image, or (None, "") if it is not an image or too big.
+    """
+    import requests
+
+    from main import FEED_USER_AGENT
+
+    try:
+        resp = (session or requests).get(
+            url, timeout=MEDIA_TIMEOUT, headers={"User-Agent": FEED_USER_AGENT}, stream=True
+        )
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "").split(";")[0].strip()
+        if not content_type.startswith("image/") or int(resp.headers.get("Content-Length") or 0) > MAX_IMAGE_BYTES:
+            resp.close()
+            return None, ""
+        data = resp.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+        resp.close()
+    except Exception:
+        return None, ""
+    if len(data) > MAX_IMAGE_BYTES:
+        return None, ""
+    return data, content_type
+
+
+def make_thumbnail(data: bytes) -> tuple:
+    """
+    (JPEG thumbnail bytes, dHash, (width, height)) for an image, or None if
+    it cannot be decoded or is too small to post.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception:
+        return None
+    if min(image.size) < MIN_IMAGE_SIDE:
+        return None
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    else:
+        image = image.convert("RGB")
+    image.thumbnail((THUMBNAIL_MAX_SIDE, THUMBNAIL_MAX_SIDE))
+
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return out.getvalue(), dhash(image), image.size
+
+
+def _store(data: bytes, extension: str) -> str:
+    """
+    Save bytes under MEDIA_DIR/<first 2 hex>/<sha256><extension>; returns the path.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    path = os.path.join(MEDIA_DIR, digest[:2], digest + extension)
+    if not os.path.exists(path):
+        write_atomic(path, data)
+    return path
+
+
+def _index_path(url: str) -> str:
+    return os.path.join(MEDIA_DIR, ".urls", hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+
+def fetch_image(url: str, session=None) -> dict:
+    """
+    {"url", "path", "phash", "size"} for one image URL, downloading and storing
+    it on first use. "path" is empty when the image was unusable.
+    """
+    index = _index_path(url)
+    try:
+        with open(index) as f:
+            entry = json.load(f)
+        if entry["path"] or time.time() - entry.get("fetched_at", 0) < FAILED_RETRY_SECONDS:
+            return entry
+    except (OSError, ValueError):
+        pass
+
+    entry = {"url": url, "path": "", "phash": None, "size": None, "fetched_at": time.time()}
+    data, content_type = _download(url, session)
+    if data is not None:
+        if Image is not None:
+            thumbnail = make_thumbnail(data)
+            if thumbnail:
+                jpeg, phash, size = thumbnail
+                entry.update(path=_store(jpeg, ".jpg"), phash=phash, size=list(size))
+        else:
+            entry["path"] = _store(data, _EXTENSIONS.get(content_type, ".img"))
+    try:
+        write_atomic(index, json.dumps(entry))
+    except OSError:
+        pass  # the image is stored; only the URL shortcut is missing
+    return entry
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PACKAGE
+# ─────────────────────────────────────────────────────────────────────────────
+
+def collect_media(content: str, items: list, session=None, max_images: int = MAX_IMAGES) -> list:
+    """
+    Images for the package's anchor stories, deduplicated, best story first.
+    Each: {"path", "url", "title", "link"}.
+    """
+    anchors = anchor_items(content, items)
+    if not anchors:
+        return []
+
+    def candidates_for(item):
+        try:
+            return candidate_images(item, session)
+        except Exception:
+            return []
+
+    from profiling import inherit
+
+    # inherit: the downloads show up in a profiled app job's profile
+    with ThreadPoolExecutor(max_workers=MEDIA_CONCURRENCY) as pool:
+        candidates = list(pool.map(inherit(candidates_for), anchors))
+        jobs = [
+            (item, pool.submit(inherit(fetch_image), url, session))
+            for item, urls in zip(anchors, candidates)
+            for url in urls
+        ]
+        results = []
+        for item, future in jobs:
+            try:
+                results.append((item, future.result()))
+            except Exception:
+                continue  # one broken image never costs the package the others
+
+    kept = []
+    for item, entry in results:
+        if not entry["path"] or any(entry["path"] == k["path"] for k in kept):
+            continue
+        if entry["phash"] is not None and any(
+            k["phash"] is not None and _hamming(entry["phash"], k["phash"]) <= PHASH_DISTANCE for k in kept
+        ):
+            continue
+        kept.append({**entry, "title": item["title"], "link": item.get("link", "")})
+        if len(kept) == max_images:
+            break
+    return [{key: k[key] for key in ("path", "url", "title", "link")} for k in kept]
+
+
+def media_section(images: list) -> str:
+    """
+    The MEDIA block for a package: one line per image with its local path.
+    """
+    lines = [f"- `{image['path']}` – {image['title']}\n  Original: {image['url']}" for image in images]
+    return "## MEDIA\n" + "\n".join(lines) + "\n"
+
+
+def attach_media(content: str, items: list, session=None) -> str:
+    """
+    `content` with a MEDIA section appended, if any usable images were found.
+    Never raises: the package is already generated (and paid for), and
+    media is optional.
+    """
+    try:
+        images = collect_media(content, items, session)
+    except Exception as e:
+        print(f"  Media skipped ({e})")
+        return content
+    if not images:
+        return content
+    return content.rstrip() + "\n\n---\n\n" + media_section(images)
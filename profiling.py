@@ -0,0 +1,357 @@
+"""
+Miss AI – X Growth Architect | Run profiler
+==========================================
+Answers "where did the time go?" for one slow run: DNS, feedparser on a
+huge feed, the summary regexes, or the API wait.
+
+  - a sampling profiler: a background thread reads every thread's stack
+    (sys._current_frames) every PROFILE_INTERVAL seconds. Samples are wall
+    clock, so threads blocked on DNS, sockets or the API show up where they
+    wait, not just where they burn CPU.
+  - tracemalloc for allocations: the top PROFILE_TOP_N lines by memory still
+    held at the end, plus the peak
+
+Profilers may overlap (the app runs several jobs at once). tracemalloc is
+process-wide, so it stays on until the last running profiler stops, and the
+allocation tables cover the whole process. Pass `threads` to sample only
+some threads' stacks: the app samples the job's own thread plus whatever
+work it hands to other threads through inherit() (the feed refresh, API
+attempts, article and image downloads), and nobody else's jobs.
+
+Output goes to PROFILE_DIR:
+    <stamp>.collapsed   "thread;module:function;... count" lines, for
+                        flamegraph.pl, speedscope or inferno
+    <stamp>.txt         the summary: hot functions, the FOCUS_FUNCTIONS,
+                        and the top allocations
+
+HOW TO RUN:
+    python3 main.py --profile
+    python3 main.py --profile "OpenAI just released a new model"
+    flamegraph.pl output/profiles/<stamp>.collapsed > flame.svg
+
+In the Streamlit app, switch on "Profile generation jobs" in the sidebar.
+"""
+
+import dis
+import functools
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+PROFILE_DIR = os.path.join("output", "profiles")
+
+# Seconds between stack samples
+PROFILE_INTERVAL = 0.005
+
+# Rows in each summary table
+PROFILE_TOP_N = 15
+
+# Frames kept per allocation. Deeper tracebacks attribute more of feedparser's
+# allocations to parse_feed, but tracemalloc gets slower with every frame
+# (allocation-heavy code runs about 5x slower at 10), so read sample counts
+# as relative, not absolute.
+PROFILE_TRACE_FRAMES = 10
+
+# Pipeline stages reported on their own, whether or not they are hot
+FOCUS_FUNCTIONS = [
+    "_fetch_one_feed",
+    "parse_feed",
+    "clean_summary",
+    "build_news_bundle",
+    "generate_resilient",
+    "save_to_markdown",
+]
+
+_STDLIB = sysconfig.get_paths()["stdlib"]
+
+# Running profilers sharing tracemalloc, and whether one of them started it
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+# Thread ident -> the running Profilers that sample it (only those given `threads`)
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PROFILER
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _frame_name(code) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+def _code_span(code) -> tuple:
+    """
+    (filename, first line, last line) of a function's code object.
+    """
+    lines = [line for _, line in dis.findlinestarts(code) if line]
+    return code.co_filename, code.co_firstlineno, max(lines, default=code.co_firstlineno)
+
+
+class Profiler:
+    """
+    Sampling CPU/wall profiler plus tracemalloc, as a context manager:
+
+        with Profiler() as profiler:
+            run()
+        print(profiler.summary)
+
+    On exit the collapsed stacks and the summary are written to PROFILE_DIR
+    (paths in `paths`) and, if `verbose`, the summary is printed.
+    `threads` limits sampling to those thread idents (default: every thread).
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, top: int = PROFILE_TOP_N, verbose: bool = True,
+                 threads=None):
+        self.interval = interval
+        self.top = top
+        self.verbose = verbose
+        # Sampled thread idents -> how many watches each has (None: every thread)
+        self.threads = None if threads is None else Counter(threads)
+        self.stacks = Counter()
+        self.samples = 0
+        self.summary = ""
+        self.paths = ()
+        self._stop = threading.Event()
+        self._thread = None
+        self._codes = {}
+        self._idle = set()
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    # ── Sampling ─────────────────────────────────────────────────────────────
+
+    def _watch(self, ident: int):
+        with _watchers_lock:
+            self.threads[ident] += 1
+            _watchers.setdefault(ident, set()).add(self)
+
+    def _unwatch(self, ident: int):
+        with _watchers_lock:
+            if self.threads.get(ident, 0) > 1:
+                self.threads[ident] -= 1
+                return
+            self.threads.pop(ident, None)
+            watchers = _watchers.get(ident, set())
+            watchers.discard(self)
+            if not watchers:
+                _watchers.pop(ident, None)
+
+    def _sample(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (self.threads is not None and ident not in self.threads):
+                    continue
+                stack = []
+                idle = True
+                while frame is not None:
+                    code = frame.f_code
+                    if code.co_name in FOCUS_FUNCTIONS:
+                        self._codes.setdefault(code, None)
+                    if idle and not code.co_filename.startswith((_STDLIB, "<")):
+                        idle = False
+                    stack.append(_frame_name(code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, "thread"))
+                key = ";".join(reversed(stack))
+                self.stacks[key] += 1
+                # Threads that are only in the standard library (idle pool
+                # workers, servers) stay in the flamegraph but not in the tables
+                if idle:
+                    self._idle.add(key)
+            self.samples += 1
+
+    def start(self):
+        global _tracing_users, _tracing_owned
+        with _tracing_lock:
+            if _tracing_users == 0:
+                _tracing_owned = not tracemalloc.is_tracing()
+                if _tracing_owned:
+                    tracemalloc.start(PROFILE_TRACE_FRAMES)
+                # Overlapping profilers share the peak from the first one's start
+                tracemalloc.reset_peak()
+            _tracing_users += 1
+        if self.threads is not None:
+            with _watchers_lock:
+                for ident in self.threads:
+                    _watchers.setdefault(ident, set()).add(self)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="missai-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        global _tracing_users
+        self._stop.set()
+        self._thread.join()
+        if self.threads is not None:
+            with _watchers_lock:
+                for ident in list(_watchers):
+                    _watchers[ident].discard(self)
+                    if not _watchers[ident]:
+                        del _watchers[ident]
+        self.elapsed = time.perf_counter() - self._started
+        with _tracing_lock:
+            # Someone outside the profiler may have stopped tracemalloc
+            if tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+            else:
+                snapshot, peak = tracemalloc.Snapshot((), PROFILE_TRACE_FRAMES), 0
+            _tracing_users -= 1
+            if _tracing_users == 0 and _tracing_owned:
+                tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.summary = self._summarize(snapshot, peak)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        self.paths = self.save()
+        if self.verbose:
+            print("\n" + self.summary)
+            print(f"Profile saved to:\n  {self.paths[0]}\n  {self.paths[1]}")
+        return False
+
+    # ── Reports ──────────────────────────────────────────────────────────────
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's collapsed-stack format, one stack per line.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _function_samples(self) -> tuple:
+        """
+        (inclusive, self) sample counts per "module:function", leaving out
+        idle threads and the threading bootstrap frames.
+        """
+        inclusive, own = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            if stack in self._idle:
+                continue
+            frames = [name for name in stack.split(";")[1:] if not name.startswith("threading:")]
+            for name in set(frames):
+                inclusive[name] += count
+            if frames:
+                own[frames[-1]] += count
+        return inclusive, own
+
+    def _focus_spans(self) -> dict:
+        """
+        {function name: [(file, first, last)]} for FOCUS_FUNCTIONS, from the
+        sampled frames and from every loaded module that defines them.
+        """
+        spans = {}
+        codes = list(self._codes)
+        for module in list(sys.modules.values()):
+            for name in FOCUS_FUNCTIONS:
+                code = getattr(getattr(module, name, None), "__code__", None)
+                if code is not None:
+                    codes.append(code)
+        for code in codes:
+            span = _code_span(code)
+            if span not in spans.setdefault(code.co_name, []):
+                spans[code.co_name].append(span)
+        return spans
+
+    def _summarize(self, snapshot, peak: int) -> str:
+        inclusive, own = self._function_samples()
+        total = max(self.samples, 1)
+        ms = self.interval * 1000
+        lines = [
+            f"PROFILE  {self.elapsed:.2f}s wall, {self.samples} samples every {ms:g} ms",
+            "  wall clock per thread (waiting counts); % of the run, so busy threads add up past 100%",
+        ]
+        if self.threads is not None:
+            lines.append("  sampled only the profiled threads and the work they handed off through inherit()")
+        lines += [
+            "",
+            f"HOT FUNCTIONS (top {self.top}, inclusive)",
+        ]
+        for name, count in inclusive.most_common(self.top):
+            lines.append(f"  {count:7d}  {count / total * 100:6.1f}%  self {own[name]:6d}  {name}")
+
+        spans = self._focus_spans()
+        held = Counter()
+        for stat in snapshot.statistics("traceback"):
+            hit = set()
+            for frame in stat.traceback:
+                for name, ranges in spans.items():
+                    if any(frame.filename == f and first <= frame.lineno <= last for f, first, last in ranges):
+                        hit.add(name)
+            for name in hit:
+                held[name] += stat.size
+
+        lines += ["", "PIPELINE STAGES (inclusive samples, memory still held at the end)"]
+        for name in FOCUS_FUNCTIONS:
+            count = sum(c for fn, c in inclusive.items() if fn.endswith(f":{name}"))
+            approx = count * self.interval
+            lines.append(
+                f"  {name:22s} {count:7d} samples  ~{approx:7.2f}s  {held[name] / 1024:9.1f} KiB"
+            )
+
+        lines += ["", f"TOP ALLOCATIONS (top {self.top} lines, memory still held in the process; peak {peak / 1e6:.1f} MB)"]
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {stat.size / 1024:9.1f} KiB  {stat.count:7d} blocks  "
+                f"{os.path.relpath(frame.filename)}:{frame.lineno}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def save(self, prefix: str = None) -> tuple:
+        """
+        Write <prefix>.collapsed and <prefix>.txt; returns both paths.
+        """
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        prefix = prefix or os.path.join(PROFILE_DIR, datetime.now().strftime("%Y%m%d_%H%M%S_%f"))
+        paths = (f"{prefix}.collapsed", f"{prefix}.txt")
+        for path, text in zip(paths, (self.collapsed(), self.summary)):
+            with open(path, "w") as f:
+                f.write(text)
+        return paths
+
+
+def inherit(fn):
+    """
+    Wrap `fn` so the thread that runs it is sampled by the profilers that
+    sample the calling thread, for as long as the call lasts. Wrap work
+    before handing it to another thread (Thread target, executor submit);
+    with no such profiler running it returns `fn` itself.
+    """
+    with _watchers_lock:
+        profilers = list(_watchers.get(threading.get_ident(), ()))
+    if not profilers:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        for profiler in profilers:
+            profiler._watch(ident)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            for profiler in profilers:
+                profiler._unwatch(ident)
+
+    return run
@@ -0,0 +1,121 @@
+"""
+Miss AI – X Growth Architect | News ranking
+==========================================
+Picks the best MAX_ITEMS articles from everything published in the window,
+instead of the latest ones from whichever feeds happened to respond.
+
+Each article gets one combined score:
+    recency decay  x  source weight  x  cluster boost
+
+  - recency decay: halves every RECENCY_HALF_LIFE_HOURS
+  - source weight: SOURCE_WEIGHTS by feed URL (default 1.0)
+  - cluster boost: stories covered by several articles (similar titles)
+    rank higher, since frequency is our proxy for importance
+
+Selection is a heap-based top-K, so ranking thousands of items stays cheap.
+All datetimes are timezone-aware UTC.
+"""
+
+import heapq
+import math
+import re
+from datetime import datetime, timezone
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Age (hours) at which an article's recency score has halved
+RECENCY_HALF_LIFE_HOURS = 8
+
+# Feed URL -> weight. Unlisted feeds count as 1.0.
+SOURCE_WEIGHTS = {
+    "https://openai.com/news/rss.xml": 1.5,
+    "https://techcrunch.com/feed/": 1.3,
+    "https://venturebeat.com/category/ai/feed/": 1.2,
+    "https://www.theverge.com/rss/index.xml": 1.1,
+    "https://finance.yahoo.com/news/rssindex": 0.8,
+    "https://feeds.finance.yahoo.com/rss/2.0/headline": 0.8,
+}
+
+# How much each extra article about the same story adds (log-scaled)
+CLUSTER_WEIGHT = 0.5
+
+# Two titles belong to the same story when they share at least CLUSTER_MIN_SHARED
+# keywords and this share of all their keywords (Jaccard similarity). One shared
+# word ("price", "AI") is not enough: union-find would chain unrelated stories.
+CLUSTER_SIMILARITY = 0.3
+CLUSTER_MIN_SHARED = 2
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "into", "over", "after",
+    "about", "your", "will", "what", "how", "why", "new", "now", "are", "its",
+    "has", "have", "just", "says", "said", "more", "than", "out", "off", "but",
+}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCORING
+# ─────────────────────────────────────────────────────────────────────────────
+
+def title_keywords(title: str) -> frozenset:
+    return frozenset(w for w in _WORD_RE.findall(title.lower()) if len(w) > 2 and w not in _STOPWORDS)
+
+
+def cluster_sizes(items: list) -> list:
+    """
+    Group items whose titles share at least CLUSTER_MIN_SHARED keywords and a
+    Jaccard similarity of CLUSTER_SIMILARITY (union-find over an inverted
+    keyword index, so only plausible pairs are compared).
+    Returns the cluster size for each item, in input order.
+    """
+    keywords = [title_keywords(item["title"]) for item in items]
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index = {}
+    for i, words in enumerate(keywords):
+        candidates = set()
+        for word in words:
+            candidates.update(index.setdefault(word, []))
+            index[word].append(i)
+        for j in candidates:
+            shared = len(words & keywords[j])
+            if shared >= CLUSTER_MIN_SHARED and shared / len(words | keywords[j]) >= CLUSTER_SIMILARITY:
+                parent[find(i)] = find(j)
+
+    roots = [find(i) for i in range(len(items))]
+    counts = {}
+    for root in roots:
+        counts[root] = counts.get(root, 0) + 1
+    return [counts[root] for root in roots]
+
+
+def score_item(item: dict, now: datetime, cluster_size: int = 1) -> float:
+    """
+    Combined score for one article (higher is better).
+    """
+    age_hours = max((now - item["published"]).total_seconds() / 3600, 0.0)
+    recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    weight = SOURCE_WEIGHTS.get(item["source_url"], 1.0)
+    return recency * weight * (1 + CLUSTER_WEIGHT * math.log(cluster_size))
+
+
+def rank_items(items: list, max_items: int = None, now: datetime = None) -> list:
+    """
+    Score every item and return the top `max_items` (all of them if None), best first.
+    Each returned dict gets "score" and "cluster_size" keys.
+    """
+    now = now or datetime.now(timezone.utc)
+    for item, size in zip(items, cluster_sizes(items)):
+        item["cluster_size"] = size
+        item["score"] = score_item(item, now, size)
+
+    if max_items is None:
+        return sorted(items, key=lambda x: x["score"], reverse=True)
+    return heapq.nlargest(max_items, items, key=lambda x: x["score"])
@@ -0,0 +1,391 @@
+"""
+Miss AI – X Growth Architect | Resilient generation
+==================================================
+Keeps a slow or overloaded messages call from stalling the whole run.
+
+  - Hedging: if the first request has not streamed its first token within
+    the HEDGE_PERCENTILE of recent first-token latencies, a duplicate request
+    is sent. Whichever finishes first wins; the others are cancelled.
+  - Fallback: timeouts, connection errors, 5xx and 529 (overloaded) move on
+    to the next model in MODEL_CASCADE.
+
+Every attempt goes through the token budget governor (budget.py), including
+the partial usage of cancelled attempts. The hedge clock starts once an
+attempt holds its reservation, so waiting on the client-side rate limiter
+does not count as first-token latency. A hedge or fallback that does not
+fit in the budget is simply not sent; the call only fails with
+BudgetExceeded when nothing else is left in flight.
+
+generate_resilient is for the sync client (threads), generate_resilient_async
+for AsyncAnthropic (tasks); both follow the same rules.
+
+ANTHROPIC_BASE_URL points the SDK at a local stub server, which is how
+`python3 bench.py resilience` and tests/test_resilience.py inject latency
+and 529/5xx errors.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from budget import BudgetExceeded, estimate_tokens, get_governor
+from fsutil import write_atomic
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Models to try in order when the previous one times out or is overloaded
+MODEL_CASCADE = ["claude-sonnet-4-6", "claude-haiku-4-5"]
+
+# Hedge when the first token is slower than this percentile of recent ones
+HEDGE_PERCENTILE = 0.95
+
+# Used until we have HEDGE_MIN_SAMPLES latencies for a model (seconds)
+HEDGE_DEFAULT_SECONDS = 10.0
+HEDGE_MIN_SAMPLES = 20
+
+# Duplicate requests allowed per call
+MAX_HEDGES = 1
+
+# Per-attempt timeout (seconds), also the longest gap between streamed chunks
+ATTEMPT_TIMEOUT = 90.0
+
+LATENCY_FILE = os.path.join("output", ".latency.json")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FIRST-TOKEN LATENCY
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LatencyTracker:
+    """
+    Recent first-token latencies per model, persisted so short-lived CLI runs
+    still hedge at a sensible threshold.
+    """
+
+    def __init__(self, path: str = LATENCY_FILE, window: int = 200):
+        self.path = path
+        self.window = window
+        self.lock = threading.Lock()
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+        self.samples = {model: deque(values, maxlen=window) for model, values in saved.items()}
+
+    def record(self, model: str, seconds: float):
+        with self.lock:
+            self.samples.setdefault(model, deque(maxlen=self.window)).append(round(seconds, 3))
+            data = {m: list(v) for m, v in self.samples.items()}
+        try:
+            write_atomic(self.path, json.dumps(data))
+        except OSError:
+            pass
+
+    def threshold(self, model: str, percentile: float = HEDGE_PERCENTILE) -> float:
+        with self.lock:
+            values = sorted(self.samples.get(model, ()))
+        if len(values) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_SECONDS
+        return values[int(percentile * (len(values) - 1))]
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker()
+        return _tracker
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ATTEMPTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Errors worth trying another model for: timeouts, dropped connections, 5xx and 529.
+    """
+    import anthropic
+
+    if isinstance(error, (anthropic.APITimeoutError, anthropic.APIConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(error, anthropic.APIStatusError) and status is not None and status >= 500
+
+
+def _attempt(client, budget_key: str, request: dict, events: queue.Queue, cancel: threading.Event, streams: dict, idx: int):
+    """
+    Stream one request and report ("reserved" | "first_token" | "done" | "error", idx, value)
+    on `events`.
+    """
+    governor = get_governor()
+    estimated = estimate_tokens(request)
+    try:
+        governor.acquire(budget_key, estimated)
+    except Exception as e:
+        events.put(("error", idx, e))
+        return
+    if cancel.is_set():
+        # The call was settled while this attempt waited for the rate limiter: don't send it
+        governor.release(budget_key, estimated)
+        return
+    events.put(("reserved", idx, None))
+
+    usage = None
+    chunks = []
+    started = time.monotonic()
+    try:
+        with client.with_options(max_retries=0, timeout=ATTEMPT_TIMEOUT).messages.stream(**request) as stream:
+            streams[idx] = stream
+            if cancel.is_set():
+                return
+            for text in stream.text_stream:
+                if not chunks:
+                    get_latency_tracker().record(request["model"], time.monotonic() - started)
+                    events.put(("first_token", idx, None))
+                chunks.append(text)
+                if cancel.is_set():
+                    break
+            if cancel.is_set():
+                snapshot = getattr(stream, "current_message_snapshot", None)
+                usage = getattr(snapshot, "usage", None)
+                return
+            usage = stream.get_final_message().usage
+        events.put(("done", idx, "".join(chunks)))
+    except Exception as e:
+        events.put(("error", idx, e))
+    finally:
+        if usage is not None:
+            governor.record(budget_key, estimated, usage)
+        else:
+            governor.release(budget_key, estimated)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HEDGED + CASCADING CALL
+# ─────────────────────────────────────────────────────────────────────────────
+
+def cascade_for(model: str) -> list:
+    """
+    `model` first, then the rest of MODEL_CASCADE.
+    """
+    return [model] + [m for m in MODEL_CASCADE if m != model]
+
+
+def generate_resilient(client, budget_key: str, models: list = None, **kwargs) -> str:
+    """
+    messages.create(**kwargs) with hedging and model fallback; returns the text.
+    `kwargs` must not include "model"; the cascade decides it.
+    Raises the last error if every model failed, or any non-retryable error at once.
+    """
+    from profiling import inherit
+
+    models = list(models or MODEL_CASCADE)
+    events = queue.Queue()
+    cancel = threading.Event()
+    streams = {}
+    started_models = []
+    in_flight = 0
+    next_model = 0
+    hedges = 0
+    first_token = False
+    # The hedge clock runs from when the latest attempt got its reservation
+    clock = 0
+    hedge_at = None
+
+    def start(model: str):
+        nonlocal in_flight, clock, hedge_at
+        idx = len(started_models)
+        started_models.append(model)
+        in_flight += 1
+        clock, hedge_at = idx, None
+        threading.Thread(
+            target=inherit(_attempt),  # attempts show up in a profiled app job's profile
+            args=(client, budget_key, dict(kwargs, model=model), events, cancel, streams, idx),
+            daemon=True,
+        ).start()
+
+    start(models[0])
+    next_model = 1
+    last_error = None
+
+    try:
+        while True:
+            timeout = None
+            if hedge_at is not None and not first_token and hedges < MAX_HEDGES:
+                timeout = max(hedge_at - time.monotonic(), 0)
+            try:
+                kind, idx, value = events.get(timeout=timeout)
+            except queue.Empty:
+                # No first token yet: send a duplicate of the slow request
+                hedges += 1
+                start(started_models[-1])
+                continue
+
+            if kind == "reserved":
+                if idx == clock:
+                    hedge_at = time.monotonic() + get_latency_tracker().threshold(started_models[idx])
+            elif kind == "first_token":
+                first_token = True
+            elif kind == "done":
+                if started_models[idx] != models[0]:
+                    print(f"  (generated with fallback model {started_models[idx]})")
+                return value
+            else:
+                in_flight -= 1
+                last_error = value
+                if isinstance(value, BudgetExceeded):
+                    # No budget for this hedge or fallback: carry on with what is in flight
+                    if in_flight == 0:
+                        raise value
+                    continue
+                if not is_retryable(value):
+                    raise value
+                if next_model < len(models):
+                    start(models[next_model])
+                    next_model += 1
+                    first_token = False
+                elif in_flight == 0:
+                    raise last_error
+    finally:
+        cancel.set()
+        for stream in list(streams.values()):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASYNC
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def _attempt_async(client, budget_key: str, request: dict, first_token: asyncio.Event,
+                         reserved: asyncio.Future) -> str:
+    """
+    Stream one request with an AsyncAnthropic client and return its text.
+    Resolves `reserved` with the loop time once the budget reservation is
+    held, and sets `first_token` when the first text arrives.
+    """
+    governor = get_governor()
+    estimated = estimate_tokens(request)
+    acquire = asyncio.ensure_future(asyncio.to_thread(governor.acquire, budget_key, estimated))
+    try:
+        await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        # The worker thread still finishes acquiring; give the reservation back when it does
+        acquire.add_done_callback(
+            lambda f: f.cancelled() or f.exception() or governor.release(budget_key, estimated)
+        )
+        raise
+    reserved.set_result(asyncio.get_running_loop().time())
+
+    usage = None
+    chunks = []
+    started = time.monotonic()
+    try:
+        async with client.with_options(max_retries=0, timeout=ATTEMPT_TIMEOUT).messages.stream(**request) as stream:
+            try:
+                async for text in stream.text_stream:
+                    if not chunks:
+                        get_latency_tracker().record(request["model"], time.monotonic() - started)
+                        first_token.set()
+                    chunks.append(text)
+            except asyncio.CancelledError:
+                snapshot = getattr(stream, "current_message_snapshot", None)
+                usage = getattr(snapshot, "usage", None)
+                raise
+            usage = (await stream.get_final_message()).usage
+        return "".join(chunks)
+    finally:
+        if usage is not None:
+            governor.record(budget_key, estimated, usage)
+        else:
+            governor.release(budget_key, estimated)
+
+
+async def generate_resilient_async(client, budget_key: str, models: list = None, **kwargs) -> str:
+    """
+    generate_resilient for an AsyncAnthropic client: the same hedging and
+    model fallback, with each attempt as a task. Losing attempts are
+    cancelled, and so are all attempts if the caller is cancelled.
+    """
+    models = list(models or MODEL_CASCADE)
+    loop = asyncio.get_running_loop()
+    attempts = {}  # in-flight task -> (model, first token event)
+    started_models = []
+    next_model = 0
+    hedges = 0
+    # The hedge clock runs from when the latest attempt got its reservation
+    clock = None
+    hedge_at = None
+
+    def start(model: str):
+        nonlocal clock, hedge_at
+        first_token = asyncio.Event()
+        reserved = loop.create_future()
+        task = asyncio.ensure_future(
+            _attempt_async(client, budget_key, dict(kwargs, model=model), first_token, reserved)
+        )
+        attempts[task] = (model, first_token)
+        started_models.append(model)
+        clock, hedge_at = reserved, None
+
+    start(models[0])
+    next_model = 1
+    last_error = None
+
+    try:
+        while True:
+            if hedge_at is None and clock.done():
+                hedge_at = clock.result() + get_latency_tracker().threshold(started_models[-1])
+            streaming = any(first_token.is_set() for _, first_token in attempts.values())
+            waiting = set(attempts)
+            timeout = None
+            if not streaming and hedges < MAX_HEDGES:
+                if hedge_at is not None:
+                    timeout = max(hedge_at - loop.time(), 0)
+                else:
+                    waiting.add(clock)
+            done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            done = {task for task in done if task in attempts}
+            if not done:
+                if hedge_at is not None and loop.time() >= hedge_at and not any(
+                    first_token.is_set() for _, first_token in attempts.values()
+                ):
+                    # No first token yet: send a duplicate of the slow request
+                    hedges += 1
+                    start(started_models[-1])
+                continue
+
+            # Successes first, in case one attempt finished as another failed
+            for task in sorted(done, key=lambda t: t.exception() is not None):
+                model, _ = attempts.pop(task)
+                error = task.exception()
+                if error is None:
+                    if model != models[0]:
+                        print(f"  (generated with fallback model {model})")
+                    return task.result()
+                last_error = error
+                if isinstance(error, BudgetExceeded):
+                    # No budget for this hedge or fallback: carry on with what is in flight
+                    continue
+                if not is_retryable(error):
+                    raise error
+                if next_model < len(models):
+                    start(models[next_model])
+                    next_model += 1
+            if not attempts:
+                raise last_error
+    finally:
+        for task in attempts:
+            task.cancel()
+        if attempts:
+            await asyncio.gather(*attempts, return_exceptions=True)
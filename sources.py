@@ -0,0 +1,377 @@
+"""
+Miss AI – X Growth Architect | Source adapters
+=============================================
+Pluggable inputs next to RSS, so trends from Reddit and X can feed the same
+24h window. Every adapter yields the same article dict as _fetch_one_feed:
+
+    title, summary, link, published (timezone-aware UTC datetime), source_url
+
+ADAPTERS:
+    RSSAdapter         the NEWS_RSS_FEEDS fetcher from main.py
+    ApifyActorAdapter  starts an Apify actor (or reads an existing dataset) and
+                       pages through its dataset concurrently, resuming from a
+                       saved cursor so a big scrape is only read once
+
+All adapters run at the same time (fetch_from_sources). A slow scrape does
+not hold up the RSS fetch: anything still running after SOURCE_TIMEOUT is
+skipped for this run. The actor run's id is saved in the cursor as soon as
+it starts, and what it has scraped so far is read (and the cursor saved)
+every APIFY_POLL_SECONDS. In long-running processes it keeps going in the
+background; in the CLI the next run picks up the same actor run from the
+last saved offset instead of paying for a new one.
+
+SOURCES FILE (--sources sources.json):
+    [
+      {"type": "apify", "actor_id": "trudax/reddit-scraper-lite", "preset": "reddit",
+       "run_input": {"searches": ["AI automation"], "sort": "new"}},
+      {"type": "apify", "actor_id": "apidojo/tweet-scraper", "preset": "x",
+       "run_input": {"searchTerms": ["AI agents"], "maxItems": 500}}
+    ]
+
+    Set APIFY_TOKEN in the environment. APIFY_API_URL points the adapter at a
+    different API server, e.g. the local stand-in in tests/stubs.py.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import main
+from fsutil import write_atomic
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+APIFY_TOKEN = os.environ.get("APIFY_TOKEN", "")
+
+# None means the public Apify API (https://api.apify.com)
+APIFY_API_URL = os.environ.get("APIFY_API_URL") or None
+
+# How long fetch_from_sources waits for adapters other than RSS (seconds)
+SOURCE_TIMEOUT = 30
+
+# Dataset items per page, and pages fetched at once
+APIFY_PAGE_SIZE = 1000
+APIFY_PAGE_CONCURRENCY = 4
+
+# While an actor run is going, read what it has scraped so far this often (seconds)
+APIFY_POLL_SECONDS = 30
+
+_TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED"}
+
+# Where dataset cursors (read offset + items still in the window) are kept
+CURSOR_DIR = os.path.join("output", ".cursors")
+
+# Field names to try, in order, for each article field
+FIELD_PRESETS = {
+    "reddit": {
+        "title": ["title"],
+        "summary": ["body", "text", "selftext"],
+        "link": ["url", "link", "permalink"],
+        "published": ["createdAt", "created_utc", "created"],
+    },
+    "x": {
+        "title": ["text", "fullText", "full_text"],
+        "summary": ["text", "fullText", "full_text"],
+        "link": ["url", "twitterUrl"],
+        "published": ["createdAt", "created_at"],
+    },
+}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ADAPTERS
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SourceAdapter:
+    """
+    Base class. fetch() returns {source_url: [article dicts]} for everything
+    published at or after `cutoff`.
+    """
+
+    name = "source"
+
+    def fetch(self, cutoff: datetime) -> dict:
+        raise NotImplementedError
+
+
+class RSSAdapter(SourceAdapter):
+    name = "rss"
+
+    def __init__(self, feeds: list = None, session=None):
+        self.feeds = feeds or main.NEWS_RSS_FEEDS
+        self.session = session
+
+    def fetch(self, cutoff: datetime) -> dict:
+        return {url: main._fetch_one_feed(url, cutoff=cutoff, session=self.session) for url in self.feeds}
+
+
+def _parse_time(value) -> datetime:
+    """
+    ISO 8601 strings, epoch seconds, or X's "Fri Nov 24 17:49:36 +0000 2023".
+    Returns a UTC datetime, or None if the value cannot be read.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = datetime.strptime(str(value), "%a %b %d %H:%M:%S %z %Y")
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class ApifyActorAdapter(SourceAdapter):
+    """
+    Reads an Apify dataset page by page and maps its items to article dicts.
+
+    With `actor_id` the actor is started (run_input) and its default dataset
+    is read while it runs; with `dataset_id` an existing dataset is read
+    directly. The run id and the read offset are saved in a cursor, so a
+    later fetch resumes the same run and only reads new items. A new actor
+    run is started only once the previous one has finished and been read.
+    """
+
+    name = "apify"
+
+    def __init__(
+        self,
+        actor_id: str = "",
+        dataset_id: str = "",
+        run_input: dict = None,
+        preset: str = "reddit",
+        fields: dict = None,
+        token: str = APIFY_TOKEN,
+        api_url: str = APIFY_API_URL,
+        page_size: int = APIFY_PAGE_SIZE,
+        page_concurrency: int = APIFY_PAGE_CONCURRENCY,
+        poll_seconds: int = APIFY_POLL_SECONDS,
+        cursor_dir: str = CURSOR_DIR,
+    ):
+        if not actor_id and not dataset_id:
+            raise ValueError("ApifyActorAdapter needs an actor_id or a dataset_id")
+        self.actor_id = actor_id
+        self.dataset_id = dataset_id
+        self.run_input = run_input or {}
+        self.fields = fields or FIELD_PRESETS[preset]
+        self.token = token
+        self.api_url = api_url
+        self.page_size = page_size
+        self.page_concurrency = page_concurrency
+        self.poll_seconds = poll_seconds
+        self.cursor_dir = cursor_dir
+        self.name = f"apify:{actor_id or dataset_id}"
+
+    def _client(self):
+        from apify_client import ApifyClient
+
+        return ApifyClient(self.token, api_url=self.api_url)
+
+    # Cursor: {"run_id": ..., "dataset_id": ..., "offset": ..., "finished": bool,
+    #          "items": [article dicts in the window]}
+    # "finished" means the run has ended and its dataset was read to the end.
+
+    def _cursor_path(self) -> str:
+        safe = "".join(c if c.isalnum() else "_" for c in (self.actor_id or self.dataset_id))
+        return os.path.join(self.cursor_dir, f"{safe}.json")
+
+    def _load_cursor(self) -> dict:
+        try:
+            with open(self._cursor_path()) as f:
+                cursor = json.load(f)
+        except (OSError, ValueError):
+            cursor = {}
+        cursor = {
+            "run_id": cursor.get("run_id", ""),
+            "dataset_id": cursor.get("dataset_id", ""),
+            "offset": cursor.get("offset", 0),
+            "finished": cursor.get("finished", False),
+            "items": cursor.get("items", []),
+        }
+        for item in cursor["items"]:
+            item["published"] = datetime.fromisoformat(item["published"])
+        return cursor
+
+    @staticmethod
+    def _new_dataset(cursor: dict, dataset_id: str, run_id: str = "") -> dict:
+        """
+        Cursor for a new run / dataset: keep the items already in the window, start reading at 0.
+        """
+        return {"run_id": run_id, "dataset_id": dataset_id, "offset": 0, "finished": False, "items": cursor["items"]}
+
+    def _save_cursor(self, cursor: dict):
+        data = dict(cursor, items=[dict(item, published=item["published"].isoformat()) for item in cursor["items"]])
+        write_atomic(self._cursor_path(), json.dumps(data))
+
+    def _pick(self, raw: dict, field: str):
+        for key in self.fields[field]:
+            if raw.get(key):
+                return raw[key]
+        return None
+
+    def to_article(self, raw: dict) -> dict:
+        """
+        Map one dataset item to an article dict, or None if it has no title or date.
+        """
+        title = " ".join(str(self._pick(raw, "title") or "").split())[:200]
+        published = _parse_time(self._pick(raw, "published"))
+        if not title or not published:
+            return None
+        return {
+            "title": title,
+            "summary": main.clean_summary(str(self._pick(raw, "summary") or "")),
+            "link": str(self._pick(raw, "link") or "").strip(),
+            "published": published,
+            "source_url": self.name,
+        }
+
+    def _read_pages(self, dataset, offset: int) -> tuple:
+        """
+        Read the dataset from `offset` to its end. The first page tells us the
+        total, the rest are fetched concurrently. Returns (raw items, new offset,
+        total); the offset only advances over pages that were read successfully
+        in order.
+        """
+        first = dataset.list_items(offset=offset, limit=self.page_size, clean=True)
+        pages = {offset: first.items}
+        end = max(first.total, offset + first.count)
+
+        offsets = list(range(offset + self.page_size, end, self.page_size))
+        if offsets:
+            with ThreadPoolExecutor(max_workers=self.page_concurrency) as pool:
+                futures = {
+                    pool.submit(dataset.list_items, offset=o, limit=self.page_size, clean=True): o
+                    for o in offsets
+                }
+                for future, o in futures.items():
+                    try:
+                        pages[o] = future.result().items
+                    except Exception:
+                        pages[o] = None
+
+        raw_items = []
+        reached = offset
+        for o in sorted(pages):
+            if pages[o] is None:
+                break
+            raw_items.extend(pages[o])
+            reached = o + self.page_size if o + self.page_size < end else end
+        return raw_items, reached, end
+
+    def _read(self, client, cursor: dict, cutoff: datetime) -> int:
+        """
+        Read the cursor's dataset from its offset, add the new articles to its
+        window and save it. Returns the dataset's item count.
+        """
+        raw_items, cursor["offset"], total = self._read_pages(client.dataset(cursor["dataset_id"]), cursor["offset"])
+        articles = [a for a in (self.to_article(raw) for raw in raw_items) if a]
+        cursor["items"] = [a for a in cursor["items"] + articles if a["published"] >= cutoff]
+        self._save_cursor(cursor)
+        return total
+
+    def fetch(self, cutoff: datetime) -> dict:
+        client = self._client()
+        cursor = self._load_cursor()
+
+        if self.dataset_id:
+            if cursor["dataset_id"] != self.dataset_id:
+                cursor = self._new_dataset(cursor, self.dataset_id)
+            self._read(client, cursor, cutoff)
+            return {self.name: cursor["items"]}
+
+        if not cursor["run_id"] or cursor["finished"]:
+            run = client.actor(self.actor_id).start(run_input=self.run_input)
+            cursor = self._new_dataset(cursor, run["defaultDatasetId"], run["id"])
+            # Saved before waiting, so a later fetch reads this run instead of starting another
+            self._save_cursor(cursor)
+
+        run_client = client.run(cursor["run_id"])
+        while True:
+            run = run_client.wait_for_finish(wait_secs=self.poll_seconds)
+            ended = run is None or run["status"] in _TERMINAL_STATUSES
+            total = self._read(client, cursor, cutoff)
+            if ended:
+                # A page that failed keeps the run pending, so the next fetch retries it
+                cursor["finished"] = cursor["offset"] >= total
+                self._save_cursor(cursor)
+                return {self.name: cursor["items"]}
+
+
+def load_sources(path: str) -> list:
+    """
+    Build adapters from a JSON list of {"type": "apify", ...keyword arguments}.
+    """
+    with open(path) as f:
+        configs = json.load(f)
+
+    adapters = []
+    for config in configs:
+        config = dict(config)
+        kind = config.pop("type", "apify")
+        if kind == "apify":
+            adapters.append(ApifyActorAdapter(**config))
+        elif kind == "rss":
+            adapters.append(RSSAdapter(config.get("feeds")))
+        else:
+            raise ValueError(f"Unknown source type {kind!r} in {path}")
+    return adapters
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FETCH FROM ALL SOURCES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def fetch_from_sources(adapters: list, cutoff: datetime, timeout: float = SOURCE_TIMEOUT) -> dict:
+    """
+    Run every adapter at once and merge their {source_url: items}.
+
+    RSS adapters are always waited for. Other adapters get `timeout` seconds;
+    if they are still running they keep going in a background thread (saving
+    their cursor when done) and this run goes ahead without them.
+    """
+    results = {}
+
+    def run(adapter):
+        try:
+            return adapter.fetch(cutoff)
+        except Exception as e:
+            print(f"  {adapter.name}... → failed ({e})")
+            return {}
+
+    futures = {}
+    for adapter in adapters:
+        future = _submit_daemon(run, adapter)
+        futures[future] = adapter
+
+    slow = [f for f, a in futures.items() if not isinstance(a, RSSAdapter)]
+    wait(slow, timeout=timeout)
+    for future, adapter in futures.items():
+        if isinstance(adapter, RSSAdapter) or future.done():
+            results.update(future.result())
+        else:
+            print(f"  {adapter.name}... → still running, skipped this run")
+    return results
+
+
+def _submit_daemon(fn, *args):
+    """
+    Run fn(*args) in a daemon thread and return a Future for its result, so a
+    long scrape never keeps the process alive or blocks interpreter exit.
+    """
+    future = Future()
+
+    def target():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, daemon=True).start()
+    return future
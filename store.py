@@ -0,0 +1,352 @@
+"""
+Miss AI – X Growth Architect | Package store
+===========================================
+Generated content packages are appended to a few large segment files
+instead of one markdown file per run:
+
+    output/store/segment-000001.dat     framed records, rotated at SEGMENT_MAX_BYTES
+    output/store/index.jsonl            one line per package: id -> segment + offset
+
+Each record is  MAGIC | payload length | CRC32 | zlib-compressed JSON payload.
+A write appends the record and fsyncs the segment before the index line is
+added, all under a file lock, so concurrent tenants and processes never
+interleave. After a crash the index is rebuilt from the segments on the
+next open, and a half-written record at the tail of the newest segment is
+cut off (its CRC or length does not check out). A process that finds the
+segment longer than its index says (another process crashed mid-write)
+runs that recovery again before appending.
+
+Package ids are unique (timestamp with microseconds, plus a counter on
+clashes). Markdown is only written on demand:
+
+    python3 main.py --export              # latest package
+    python3 main.py --export all
+    python3 main.py --export 20260219_165005_123456_News__last_24h
+"""
+
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+from fsutil import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still serialised within the process
+    fcntl = None
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+STORE_DIR = os.path.join("output", "store")
+
+# Start a new segment file once the current one reaches this size
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+# fsync every write; turn off only for throwaway batch runs
+STORE_FSYNC = True
+
+_MAGIC = b"MAPK"
+_HEADER = struct.Struct("<4sII")
+_SEGMENT_RE = re.compile(r"^segment-(\d{6})\.dat$")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RECORDS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def encode_record(record: dict) -> bytes:
+    payload = zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+    return _HEADER.pack(_MAGIC, len(payload), zlib.crc32(payload)) + payload
+
+
+def read_record(f) -> tuple:
+    """
+    (record, frame length) for the record at the file's position, or
+    (None, 0) at the end of the file or at a torn / corrupt record.
+    """
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None, 0
+    magic, length, crc = _HEADER.unpack(header)
+    payload = f.read(length)
+    if magic != _MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+        return None, 0
+    return json.loads(zlib.decompress(payload)), _HEADER.size + length
+
+
+def render_markdown(record: dict) -> str:
+    """
+    The package as the markdown file save_to_markdown used to write.
+    """
+    generated = datetime.fromisoformat(record["created"])
+    header = (
+        f"# {record['brand']} – Content Package\n\n"
+        f"**Context:** {record['context']}  \n"
+        f"**Generated:** {generated.strftime('%B %d, %Y at %H:%M')}\n\n"
+        f"---\n\n"
+    )
+    return header + record["content"]
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STORE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class PackageStore:
+    """
+    Append-only, segmented, compressed package log with an offset index.
+    Safe to share between threads; appends from several processes are
+    serialised with a file lock.
+    """
+
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.jsonl")
+        self.lock = threading.Lock()
+        self.entries = []
+        self.by_id = {}
+        # Segment number -> end of its last indexed record
+        self.ends = {}
+        self._index_pos = 0
+        self._recovered = False
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.root, exist_ok=True)
+        with self.lock, open(os.path.join(self.root, ".lock"), "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.root, f"segment-{number:06d}.dat")
+
+    def _segments(self) -> list:
+        numbers = []
+        for name in os.listdir(self.root):
+            match = _SEGMENT_RE.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    # ── Index ────────────────────────────────────────────────────────────────
+
+    def _add_entry(self, entry: dict):
+        self.entries.append(entry)
+        self.by_id[entry["id"]] = entry
+        end = entry["offset"] + entry["length"]
+        self.ends[entry["segment"]] = max(self.ends.get(entry["segment"], 0), end)
+
+    def _sync_index(self):
+        """
+        Read index lines added since the last call (by this or another process).
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn last line; recovery rewrites it
+                    self._index_pos += len(line)
+                    entry = json.loads(line)
+                    if entry["id"] not in self.by_id:
+                        self._add_entry(entry)
+        except OSError:
+            pass
+
+    def _recover(self):
+        """
+        Index every intact record the index does not know about yet (a crash
+        between the segment write and the index write) and cut off a torn
+        record at the end of the newest segment. Runs under the lock, once per
+        process and again whenever append() finds the newest segment longer
+        than the index says. Older segments are never truncated, only read up
+        to the first bad record.
+        """
+        self._sync_index()
+        with open(self.index_path, "ab") as index:
+            index.truncate(self._index_pos)
+            segments = self._segments()
+            for number in segments:
+                path = self._segment_path(number)
+                offset = self.ends.get(number, 0)
+                if offset >= os.path.getsize(path):
+                    continue
+                with open(path, "r+b") as f:
+                    f.seek(offset)
+                    while True:
+                        record, length = read_record(f)
+                        if record is None:
+                            break
+                        entry = self._entry(record, number, offset, length)
+                        index.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                        self._add_entry(entry)
+                        offset += length
+                    if number == segments[-1]:
+                        f.truncate(offset)
+        self._index_pos = os.path.getsize(self.index_path)
+        self._recovered = True
+
+    @staticmethod
+    def _entry(record: dict, segment: int, offset: int, length: int) -> dict:
+        return {
+            "id": record["id"],
+            "segment": segment,
+            "offset": offset,
+            "length": length,
+            "tenant_id": record["tenant_id"],
+            "context": record["context"],
+            "created": record["created"],
+        }
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def _new_id(self, created: datetime, context_title: str) -> str:
+        safe_topic = "".join(c if c.isalnum() or c in " -_" else "" for c in context_title)
+        safe_topic = safe_topic[:40].strip().replace(" ", "_") or "News"
+        base = f"{created:%Y%m%d_%H%M%S_%f}_{safe_topic}"
+        package_id, n = base, 1
+        while package_id in self.by_id:
+            n += 1
+            package_id = f"{base}_{n}"
+        return package_id
+
+    def append(self, context_title: str, content: str, tenant_id: str = "", brand: str = "Miss AI") -> str:
+        """
+        Store one package durably. Returns its id.
+        """
+        with self._locked():
+            if not self._recovered:
+                self._recover()
+            else:
+                self._sync_index()
+
+            created = datetime.now()
+            record = {
+                "id": self._new_id(created, context_title),
+                "tenant_id": tenant_id,
+                "brand": brand,
+                "context": context_title,
+                "created": created.isoformat(),
+                "content": content,
+            }
+            frame = encode_record(record)
+
+            segments = self._segments()
+            number = segments[-1] if segments else 1
+            path = self._segment_path(number)
+            if os.path.exists(path) and os.path.getsize(path) != self.ends.get(number, 0):
+                # Another process crashed after writing to the segment: index or cut off what it left
+                self._recover()
+            if os.path.exists(path) and os.path.getsize(path) >= SEGMENT_MAX_BYTES:
+                number += 1
+                path = self._segment_path(number)
+
+            with open(path, "ab") as f:
+                offset = f.tell()
+                f.write(frame)
+                f.flush()
+                if STORE_FSYNC:
+                    os.fsync(f.fileno())
+
+            entry = self._entry(record, number, offset, len(frame))
+            with open(self.index_path, "ab") as index:
+                index.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+            self._index_pos = os.path.getsize(self.index_path)
+            self._add_entry(entry)
+            return record["id"]
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def refresh(self):
+        """
+        Pick up packages written since the last read, by any process.
+        """
+        with self._locked():
+            if not self._recovered:
+                self._recover()
+            else:
+                self._sync_index()
+
+    def packages(self, tenant_id: str = None) -> list:
+        """
+        Index entries, oldest first; optionally only one tenant's.
+        """
+        self.refresh()
+        return [e for e in self.entries if tenant_id is None or e["tenant_id"] == tenant_id]
+
+    def get(self, package_id: str) -> dict:
+        """
+        The full record for a package id. Raises KeyError if it is unknown.
+        """
+        entry = self.by_id.get(package_id)
+        if entry is None:
+            self.refresh()
+            entry = self.by_id[package_id]
+        with open(self._segment_path(entry["segment"]), "rb") as f:
+            f.seek(entry["offset"])
+            record, _ = read_record(f)
+        if record is None:
+            raise ValueError(f"Package {package_id} is corrupt in segment {entry['segment']}")
+        return record
+
+    def iter_records(self):
+        """
+        Every indexed package record, oldest first. Follows the index offsets,
+        reading each segment front to back, so garbage between records (a
+        crashed writer) never hides the records after it. Corrupt records are
+        skipped.
+        """
+        self.refresh()
+        entries = sorted(self.entries, key=lambda e: (e["segment"], e["offset"]))
+        f, number = None, None
+        try:
+            for entry in entries:
+                if entry["segment"] != number:
+                    if f:
+                        f.close()
+                    number = entry["segment"]
+                    f = open(self._segment_path(number), "rb")
+                if f.tell() != entry["offset"]:
+                    f.seek(entry["offset"])
+                record, _ = read_record(f)
+                if record is not None:
+                    yield record
+        finally:
+            if f:
+                f.close()
+
+    def export(self, package_id: str, output_dir: str = None) -> str:
+        """
+        Write one package as markdown (atomically) and return the file path.
+        Defaults to output/ (or output/<tenant_id>), like the old per-run files.
+        """
+        record = self.get(package_id)
+        output_dir = output_dir or os.path.join(os.path.dirname(self.root), record["tenant_id"])
+        path = os.path.join(output_dir, f"{record['id']}.md")
+        write_atomic(path, render_markdown(record))
+        return path
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> PackageStore:
+    """
+    Process-wide PackageStore, created on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PackageStore()
+        return _store
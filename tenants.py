@@ -0,0 +1,201 @@
+"""
+Miss AI – X Growth Architect | Multi-brand tenants
+=================================================
+Runs the content engine for several brands (tenants) at once.
+
+One fetch pass covers the union of every tenant's feeds; each tenant then
+dedupes and ranks only its own feeds, and generation fans out per tenant
+in parallel. Each tenant gets its own system
+prompt (brand voice + enabled outputs), which is prompt-cached separately,
+so serving 50 brands costs one fetch, not 50.
+
+TENANT PROFILES (tenants.json, see tenants.example.json):
+    [
+      {
+        "id": "nz-realestate",
+        "name": "Kiwi Property Pulse",
+        "voice_prompt_file": "voices/nz_realestate.txt",
+        "category": "New Zealand property, interest rates and lending",
+        "audience": "first home buyers",
+        "pillars": ["Market Moves", "Buyer Playbook", "Rates Watch"],
+        "feeds": ["https://www.interest.co.nz/rss"],
+        "outputs": {"short_post_1": false, "poll": true},
+        "schedule": ["07:00", "17:00"],
+        "analytics_store": "output/analytics/nz-realestate.npz"
+      }
+    ]
+
+    id           folder name under output/ (required)
+    name         brand name used in the instructions and file header
+    voice_prompt / voice_prompt_file
+                 brand voice; defaults to the Miss AI voice in main.py
+    category     what the brand's news covers, e.g. "crypto and DeFi";
+                 defaults to main.NEWS_CATEGORY
+    audience     who the practical short post is for; defaults to
+                 main.TARGET_AUDIENCE
+    pillars      content pillars for METADATA; the Miss AI voice lists its own
+    feeds        subset of feeds to use; defaults to NEWS_RSS_FEEDS
+    outputs      output blocks to switch off, e.g. {"poll": false}
+    schedule     UTC "HH:MM" run times, used by --due
+    analytics_store
+                 this brand's X analytics (python3 analytics.py import <file>
+                 --store <path>), for grounded posting times; without it the
+                 model's suggested times are kept
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import main
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Maximum number of tenants generating at once
+TENANT_CONCURRENCY = 8
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PROFILES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def load_tenants(path: str = "tenants.json") -> list:
+    """
+    Load tenant profiles from a JSON file and fill in defaults.
+    Each tenant gets a ready-made "system_prompt".
+    """
+    with open(path) as f:
+        profiles = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    tenants = []
+    for profile in profiles:
+        if not profile.get("id"):
+            raise ValueError(f"Tenant profile without an id in {path}")
+
+        voice = profile.get("voice_prompt")
+        if not voice and profile.get("voice_prompt_file"):
+            with open(os.path.join(base_dir, profile["voice_prompt_file"])) as f:
+                voice = f.read()
+        pillars = profile.get("pillars")
+        if not voice:
+            voice = main.BRAND_VOICE_PROMPT
+        elif pillars is None:
+            pillars = []  # a custom voice has no pillar list for METADATA to refer to
+        if not voice.endswith("\n\n"):
+            voice = voice.rstrip("\n") + "\n\n"
+
+        tenant = {
+            "id": profile["id"],
+            "name": profile.get("name") or "Miss AI",
+            "category": profile.get("category") or main.NEWS_CATEGORY,
+            "audience": profile.get("audience") or main.TARGET_AUDIENCE,
+            "feeds": profile.get("feeds") or list(main.NEWS_RSS_FEEDS),
+            "outputs": profile.get("outputs") or {},
+            "schedule": profile.get("schedule") or [],
+            "analytics_store": profile.get("analytics_store") or "",
+        }
+        tenant["system_prompt"] = main.build_system_prompt(
+            voice, tenant["outputs"], brand=tenant["name"], audience=tenant["audience"], pillars=pillars
+        )
+        tenants.append(tenant)
+    return tenants
+
+
+def is_due(tenant: dict, now: datetime = None) -> bool:
+    """
+    True if one of the tenant's "HH:MM" schedule slots falls in the current UTC hour.
+    Tenants without a schedule are always due.
+    """
+    if not tenant["schedule"]:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return any(int(slot.split(":")[0]) == now.hour for slot in tenant["schedule"])
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED FETCH + PER-TENANT GENERATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+def fetch_shared_items(tenants: list, hours: int = 24) -> dict:
+    """
+    One fetch pass over the union of all tenants' feeds.
+    Returns {feed url: [recent article dicts]}, not deduplicated yet: if the
+    union were deduplicated, a story carried by two tenants' feeds would keep
+    only one feed's copy and the other tenant would lose it.
+    """
+    feeds = list(dict.fromkeys(url for tenant in tenants for url in tenant["feeds"]))
+    return main.fetch_feed_items(hours=hours, feeds=feeds)
+
+
+def items_for_tenant(tenant: dict, feed_items: dict, hours: int = 24, max_items: int = main.MAX_ITEMS) -> list:
+    """
+    The tenant's top-ranked `max_items`, deduplicated across its own feeds only.
+    The dicts are new on every call, so tenants never share an item.
+    """
+    own = {url: feed_items.get(url, []) for url in tenant["feeds"]}
+    return main.select_recent(own, hours=hours, max_items=max_items, verbose=False)
+
+
+def run_tenant(tenant: dict, items: list) -> str:
+    """
+    Generate and store one tenant's package from its own items (see
+    items_for_tenant). Returns the package id.
+    Token usage is tracked and limited under the tenant id (see budget.py).
+    Full-article excerpts and images come from shared on-disk caches, so a
+    story several tenants cover is only downloaded once. Posting times come
+    from the tenant's own analytics store, if it has one.
+    """
+    from analytics import fill_posting_times, get_store
+    from enrich import enrich_items
+    from media import attach_media
+
+    tenant_items = enrich_items(items)
+    news_bundle = main.build_news_bundle(tenant_items)
+    content = main.generate_content(
+        news_bundle,
+        verbose=False,
+        system_prompt=tenant["system_prompt"],
+        brand=tenant["name"],
+        budget_key=tenant["id"],
+        category=tenant["category"],
+        audience=tenant["audience"],
+    )
+    store = get_store(tenant["analytics_store"]) if tenant["analytics_store"] else None
+    if store is not None:
+        content = fill_posting_times(content, store=store)
+    content = attach_media(content, tenant_items)
+    return main.save_to_markdown("News – last 24h", content, tenant_id=tenant["id"], brand=tenant["name"])
+
+
+def run_tenants(tenants: list, due_only: bool = False) -> dict:
+    """
+    Fetch once for all tenants, then generate per tenant in parallel.
+    Returns {tenant id: package id, or an error/skip message}.
+    """
+    if due_only:
+        tenants = [tenant for tenant in tenants if is_due(tenant)]
+    if not tenants:
+        return {}
+
+    feed_items = fetch_shared_items(tenants)
+
+    results = {}
+    runnable = []
+    for tenant in tenants:
+        items = items_for_tenant(tenant, feed_items)
+        if items:
+            runnable.append((tenant, items))
+        else:
+            results[tenant["id"]] = "skipped (no recent items in its feeds)"
+
+    print(f"\nGenerating for {len(runnable)} tenants...")
+    with ThreadPoolExecutor(max_workers=max(1, min(len(runnable), TENANT_CONCURRENCY))) as pool:
+        futures = {tenant["id"]: pool.submit(run_tenant, tenant, items) for tenant, items in runnable}
+        for tenant_id, future in futures.items():
+            try:
+                results[tenant_id] = future.result()
+            except Exception as e:
+                results[tenant_id] = f"failed ({e})"
+    return results
@@ -0,0 +1,241 @@
+"""
+Local stand-ins for the HTTP APIs the pipeline talks to, so the tests run
+offline and can inject latency and errors.
+
+    StubApify      actor runs + paginated dataset items (Apify API v2)
+    StubMessages   streaming Messages API (Anthropic), scripted per request
+    StubPages      article pages, with a delay, counting requests per path
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _StubServer:
+    """
+    Runs a ThreadingHTTPServer in a daemon thread; requests go to self.handle(handler).
+    """
+
+    def __init__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def do_POST(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def send_json(handler, status: int, data, headers: dict = None):
+        body = json.dumps(data).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, str(value))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# APIFY
+# ─────────────────────────────────────────────────────────────────────────────
+
+class StubApify(_StubServer):
+    """
+    Apify API stand-in.
+
+      datasets         {dataset id: [items]}; tests append to them freely
+      runs             {run id: {"id", "status", "defaultDatasetId"}}
+      run_status       status new runs start in ("SUCCEEDED" or "RUNNING")
+      run_items        items a new run's dataset starts with
+      failing_offsets  dataset page offsets that answer 500
+      page_delay       seconds each dataset page takes
+      item_requests    (dataset id, offset) of every dataset page request
+      started          actor runs started
+      max_in_flight    most dataset page requests served at once
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.datasets = {}
+        self.runs = {}
+        self.run_status = "SUCCEEDED"
+        self.run_items = []
+        self.failing_offsets = set()
+        self.page_delay = 0.0
+        self.item_requests = []
+        self.started = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def handle(self, handler):
+        url = urlparse(handler.path)
+        parts = url.path.strip("/").split("/")
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if handler.command == "POST" and parts[:2] == ["v2", "acts"] and parts[-1] == "runs":
+            handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+            with self.lock:
+                self.started += 1
+                run_id, dataset_id = f"run{self.started}", f"runds{self.started}"
+                self.datasets[dataset_id] = list(self.run_items)
+                self.runs[run_id] = {"id": run_id, "status": self.run_status, "defaultDatasetId": dataset_id}
+            return self.send_json(handler, 201, {"data": self.runs[run_id]})
+
+        if parts[:2] == ["v2", "actor-runs"] and len(parts) == 3:
+            run = self.runs.get(parts[2])
+            if run is None:
+                return self.send_json(handler, 404, {"error": {"type": "record-not-found", "message": "no run"}})
+            return self.send_json(handler, 200, {"data": run})
+
+        if parts[:2] == ["v2", "datasets"] and parts[-1] == "items":
+            return self._items(handler, parts[2], int(query.get("offset", 0)), int(query.get("limit", 1000)))
+
+        self.send_json(handler, 404, {"error": {"type": "page-not-found", "message": handler.path}})
+
+    def _items(self, handler, dataset_id: str, offset: int, limit: int):
+        with self.lock:
+            self.item_requests.append((dataset_id, offset))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.page_delay)
+            if offset in self.failing_offsets:
+                return self.send_json(handler, 500, {"error": {"type": "internal-error", "message": "boom"}})
+            items = self.datasets.get(dataset_id, [])
+            page = items[offset:offset + limit]
+            self.send_json(handler, 200, page, {
+                "X-Apify-Pagination-Total": len(items),
+                "X-Apify-Pagination-Offset": offset,
+                "X-Apify-Pagination-Count": len(page),
+                "X-Apify-Pagination-Limit": limit,
+                "X-Apify-Pagination-Desc": "",
+            })
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MESSAGES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class StubMessages(_StubServer):
+    """
+    Streaming Messages API stand-in. Each request takes the next behaviour
+    from `script`, then "ok" once it runs out:
+
+      "ok"           streams "<behaviour> answer from <model> #<request number>"
+      "slow:<s>"     sends message_start, waits <s> seconds, then streams
+      "<status>"     answers with that HTTP status, e.g. "529" or "400"
+
+      requests       (model, behaviour) per request, in arrival order
+      arrivals       time.monotonic() of each request
+      disconnected   request numbers whose client hung up before the end
+      finished       request numbers that streamed to the end
+    """
+
+    def __init__(self, script: list = None):
+        super().__init__()
+        self.script = list(script or [])
+        self.requests = []
+        self.arrivals = []
+        self.disconnected = []
+        self.finished = []
+
+    def handle(self, handler):
+        request = json.loads(handler.rfile.read(int(handler.headers.get("Content-Length", 0))))
+        with self.lock:
+            number = len(self.requests)
+            behaviour = self.script.pop(0) if self.script else "ok"
+            self.requests.append((request["model"], behaviour))
+            self.arrivals.append(time.monotonic())
+
+        if behaviour.isdigit():
+            status = int(behaviour)
+            kind = "overloaded_error" if status == 529 else "api_error" if status >= 500 else "invalid_request_error"
+            return self.send_json(handler, status, {"type": "error", "error": {"type": kind, "message": behaviour}})
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.end_headers()
+        try:
+            handler.wfile.write(_sse("message_start", {"type": "message_start", "message": {
+                "id": f"msg_{number}", "type": "message", "role": "assistant", "model": request["model"],
+                "content": [], "stop_reason": None, "stop_sequence": None,
+                "usage": {"input_tokens": 10, "output_tokens": 1},
+            }}))
+            handler.wfile.flush()
+            if behaviour.startswith("slow:"):
+                deadline = time.monotonic() + float(behaviour.split(":")[1])
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    handler.wfile.write(b": ping\n\n")
+                    handler.wfile.flush()
+            text = f"{behaviour} answer from {request['model']} #{number}"
+            handler.wfile.write(_sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}))
+            handler.wfile.write(_sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}}))
+            handler.wfile.write(_sse("content_block_stop", {"type": "content_block_stop", "index": 0}))
+            handler.wfile.write(_sse("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": 5}}))
+            handler.wfile.write(_sse("message_stop", {"type": "message_stop"}))
+            handler.wfile.flush()
+            with self.lock:
+                self.finished.append(number)
+        except (BrokenPipeError, ConnectionResetError):
+            with self.lock:
+                self.disconnected.append(number)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PAGES
+# ─────────────────────────────────────────────────────────────────────────────
+
+class StubPages(_StubServer):
+    """
+    Serves the same small article page at every path, after `delay` seconds.
+    `hits` counts the requests per path.
+    """
+
+    PAGE = (
+        "<html><head><meta property='og:image' content='/lead.jpg'></head><body><article>"
+        "<p>The startup raised $12 million to automate invoicing for small businesses.</p>"
+        "</article></body></html>"
+    )
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.delay = delay
+        self.hits = {}
+
+    def handle(self, handler):
+        with self.lock:
+            self.hits[handler.path] = self.hits.get(handler.path, 0) + 1
+        time.sleep(self.delay)
+        body = self.PAGE.encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
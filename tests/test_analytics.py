@@ -0,0 +1,45 @@
+"""
+Timestamps from X analytics exports (analytics.py).
+"""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import analytics
+
+
+@pytest.fixture
+def host_in_auckland(monkeypatch):
+    # A host zone far from both UTC and POSTING_TIMEZONE
+    monkeypatch.setenv("TZ", "Pacific/Auckland")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize("value", [
+    "Tue, Mar 05, 2024",
+    "2024-03-05 00:00 +0000",
+    "2024-03-05T00:00:00",
+    "Tue Mar 05 00:00:00 +0000 2024",
+])
+def test_every_format_is_utc(value, host_in_auckland):
+    parsed = analytics._parse_time(value)
+
+    assert parsed == datetime(2024, 3, 5, tzinfo=timezone.utc)
+    assert parsed.timestamp() == 1709596800
+
+
+def test_date_only_posts_land_in_the_same_slot_on_any_host(host_in_auckland):
+    pytest.importorskip("numpy")
+    store = analytics.PostStore.load("missing.npz")
+    rows = [{"id": "1", "text": "post", "time": analytics._parse_time("Tue, Mar 05, 2024"),
+             "impressions": 100, "engagements": 5}]
+
+    store.add(rows, {})
+
+    # Midnight UTC on Tuesday is Monday 7pm in New York
+    assert (int(store.weekday[0]), int(store.hour[0])) == (0, 19)
@@ -0,0 +1,61 @@
+"""
+Daily budget reservations in the token budget governor.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import budget
+
+
+@pytest.fixture
+def governor(tmp_path, monkeypatch):
+    monkeypatch.setattr(budget, "DAILY_TOKEN_BUDGETS", {"default": 30_000})
+    return budget.Governor(budget.Ledger(str(tmp_path / "ledger.json")))
+
+
+def usage(input_tokens: int, output_tokens: int):
+    return SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+def test_call_bigger_than_what_is_left_is_refused(governor):
+    governor.ledger.record("t", 29_999, 0)
+
+    with pytest.raises(budget.BudgetExceeded):
+        governor.acquire("t", 14_000)
+
+
+def test_concurrent_callers_cannot_overspend(governor):
+    admitted, refused = [], []
+    barrier = threading.Barrier(6)
+
+    def call():
+        barrier.wait()
+        try:
+            governor.acquire("t", 14_000)
+            admitted.append(1)
+        except budget.BudgetExceeded:
+            refused.append(1)
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(admitted) == 2 and len(refused) == 4
+    assert governor.remaining("t") == 2_000
+
+
+def test_record_settles_and_release_refunds(governor):
+    governor.acquire("t", 14_000)
+    governor.acquire("t", 14_000)
+
+    governor.record("t", 14_000, usage(3_000, 1_000))
+    assert governor.remaining("t") == 30_000 - 4_000 - 14_000
+
+    governor.release("t", 14_000)
+    assert governor.remaining("t") == 26_000
+    assert governor.reserved == {}
@@ -0,0 +1,61 @@
+"""
+Article cache writes and page charset detection (enrich.py).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import enrich
+from stubs import StubPages
+
+
+def test_concurrent_cache_writes_of_one_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(enrich, "ENRICH_CACHE_DIR", str(tmp_path))
+    errors = []
+
+    def write(n):
+        for i in range(200):
+            try:
+                enrich._write_cache("https://example.com/a", {"url": "a", "text": f"{n}-{i}"})
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert enrich._read_cache("https://example.com/a")["url"] == "a"
+    assert [p.name for p in tmp_path.iterdir()] == [p.name for p in tmp_path.glob("*.json")]
+
+
+def test_page_encoding():
+    page = '<html><head><meta charset="utf-8"></head><p>“Quoted”</p>'.encode("utf-8")
+
+    assert enrich.page_encoding("text/html", page) == "utf-8"
+    assert page.decode(enrich.page_encoding("text/html", page)).count("“Quoted”") == 1
+    assert enrich.page_encoding("text/html; charset=windows-1252", page) == "cp1252"
+    assert enrich.page_encoding("text/html", b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">') == "iso8859-1"
+    assert enrich.page_encoding("text/html", b"<p>no charset</p>") == "utf-8"
+    assert enrich.page_encoding("text/html", b'<meta charset="bogus">') == "utf-8"
+
+
+def test_concurrent_fetches_of_one_url_download_it_once(tmp_path, monkeypatch):
+    pytest.importorskip("requests")
+    monkeypatch.setattr(enrich, "ENRICH_CACHE_DIR", str(tmp_path))
+    pages = StubPages(delay=0.3)
+    try:
+        url = f"{pages.url}/story"
+        # Eight tenants enriching the same top story at once
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            entries = list(pool.map(lambda _: enrich.fetch_article(url), range(8)))
+    finally:
+        pages.close()
+
+    assert pages.hits == {"/story": 1}
+    assert all("$12 million" in entry["excerpt"] for entry in entries)
+    assert enrich._in_flight == {}
@@ -0,0 +1,93 @@
+"""
+Overlapping profilers (profiling.py), as when the app profiles several jobs at once.
+"""
+
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import Profiler, inherit
+
+
+def job_a(started: threading.Event, release: threading.Event, profilers: dict):
+    profiler = profilers["a"] = Profiler(interval=0.001, verbose=False, threads=[threading.get_ident()])
+    profiler.start()
+    started.set()
+    release.wait()
+    profiler.stop()
+
+
+def job_b(a_done: threading.Event, profilers: dict):
+    profiler = profilers["b"] = Profiler(interval=0.001, verbose=False, threads=[threading.get_ident()])
+    profiler.start()
+    a_done.wait()
+    data = [bytes(1000) for _ in range(100)]
+    time.sleep(0.05)
+    profiler.stop()
+    return data
+
+
+def test_first_job_finishing_does_not_break_the_second():
+    assert not tracemalloc.is_tracing()
+    profilers = {}
+    a_started, a_release, a_done = threading.Event(), threading.Event(), threading.Event()
+    errors = []
+
+    def run_b():
+        try:
+            job_b(a_done, profilers)
+        except Exception as e:
+            errors.append(e)
+
+    thread_a = threading.Thread(target=job_a, args=(a_started, a_release, profilers))
+    thread_b = threading.Thread(target=run_b)
+    thread_a.start()
+    a_started.wait()
+    thread_b.start()
+    time.sleep(0.05)
+    # A starts first and finishes first, while B is still running
+    a_release.set()
+    thread_a.join()
+    still_tracing = tracemalloc.is_tracing()
+    a_done.set()
+    thread_b.join()
+
+    assert still_tracing and errors == []
+    assert not tracemalloc.is_tracing()
+    a, b = profilers["a"], profilers["b"]
+    assert "TOP ALLOCATIONS" in b.summary and b.samples > 0
+    # Each profiler sampled only its own job's thread
+    assert b.stacks and all("job_b" in stack and "job_a" not in stack for stack in b.stacks)
+    assert a.stacks and all("job_a" in stack and "job_b" not in stack for stack in a.stacks)
+
+
+def handed_off_work():
+    time.sleep(0.1)
+
+
+def unrelated_work(stop: threading.Event):
+    stop.wait()
+
+
+def test_work_handed_off_through_inherit_is_sampled():
+    stop = threading.Event()
+    unrelated = threading.Thread(target=unrelated_work, args=(stop,))
+    unrelated.start()
+    profiler = Profiler(interval=0.001, verbose=False, threads=[threading.get_ident()])
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            profiler.start()
+            pool.submit(inherit(handed_off_work)).result()
+            # Not inherited: another job's work on the same pool
+            pool.submit(handed_off_work)
+            profiler.stop()
+    finally:
+        stop.set()
+        unrelated.join()
+
+    assert any("handed_off_work" in stack for stack in profiler.stacks)
+    assert not any("unrelated_work" in stack for stack in profiler.stacks)
+    # The pool thread stopped being sampled once the inherited call returned
+    assert set(profiler.threads) == {threading.get_ident()}
+    assert inherit(handed_off_work) is handed_off_work
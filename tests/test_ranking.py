@@ -0,0 +1,28 @@
+"""
+Story clustering in the news ranking (ranking.py).
+"""
+
+from ranking import cluster_sizes
+
+
+def clusters(titles: list) -> list:
+    return cluster_sizes([{"title": title} for title in titles])
+
+
+def test_one_shared_word_does_not_chain_stories():
+    assert clusters([
+        "Bitcoin price",
+        "Nvidia price target raised",
+        "Bitcoin ETF inflows hit record",
+    ]) == [1, 1, 1]
+
+
+def test_same_story_from_different_outlets_clusters():
+    assert clusters([
+        "Morgan Stanley raises Nvidia price target to $200",
+        "Nvidia stock price target raised by Morgan Stanley",
+        "OpenAI releases GPT-5 to all ChatGPT users",
+        "OpenAI rolls out GPT-5 for every ChatGPT user",
+        "Ethereum ETF inflows lag as Bitcoin ETF inflows hit record",
+        "Small businesses are slow to adopt AI agents, survey finds",
+    ]) == [2, 2, 2, 2, 1, 1]
@@ -0,0 +1,137 @@
+"""
+Hedging and model fallback (resilience.py) against a local Messages API stub
+that injects latency and 529/5xx errors (stubs.StubMessages). Every case runs
+for the sync client and for AsyncAnthropic.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+anthropic = pytest.importorskip("anthropic")
+
+import budget  # noqa: E402
+import resilience  # noqa: E402
+from stubs import StubMessages  # noqa: E402
+
+HEDGE_SECONDS = 0.3
+REQUEST = {"max_tokens": 16, "messages": [{"role": "user", "content": "hi"}]}
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    governor = budget.Governor(budget.Ledger(str(tmp_path / "ledger.json")))
+    monkeypatch.setattr(budget, "_governor", governor)
+    monkeypatch.setattr(resilience, "_tracker", resilience.LatencyTracker(str(tmp_path / "latency.json")))
+    monkeypatch.setattr(resilience, "MODEL_CASCADE", ["model-a", "model-b"])
+    monkeypatch.setattr(resilience, "HEDGE_DEFAULT_SECONDS", HEDGE_SECONDS)
+    yield governor
+    # Every attempt settles its reservation, including cancelled ones (sync
+    # attempts finish in their own threads, so allow them a moment)
+    assert wait_for(lambda: governor.reserved == {})
+
+
+@pytest.fixture
+def stub():
+    server = StubMessages()
+    yield server
+    server.close()
+
+
+@pytest.fixture(params=["sync", "async"])
+def generate(request, stub):
+    """
+    generate(**kwargs) -> text, through generate_resilient or generate_resilient_async.
+    """
+    if request.param == "sync":
+        client = anthropic.Anthropic(api_key="sk-ant-test", base_url=stub.url)
+        return lambda: resilience.generate_resilient(client, "test", **REQUEST)
+
+    def run():
+        async def call():
+            client = anthropic.AsyncAnthropic(api_key="sk-ant-test", base_url=stub.url)
+            try:
+                return await resilience.generate_resilient_async(client, "test", **REQUEST)
+            finally:
+                await client.close()
+
+        return asyncio.run(call())
+
+    return run
+
+
+def wait_for(condition, seconds: float = 3.0) -> bool:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_healthy_call_is_not_hedged(stub, generate):
+    assert generate() == "ok answer from model-a #0"
+    assert stub.requests == [("model-a", "ok")]
+
+
+def test_hedge_fires_after_threshold_and_wins(stub, generate):
+    stub.script = ["slow:3"]
+    started = time.monotonic()
+
+    assert generate() == "ok answer from model-a #1"
+
+    assert time.monotonic() - started < 2
+    assert [model for model, _ in stub.requests] == ["model-a", "model-a"]
+    gap = stub.arrivals[1] - stub.arrivals[0]
+    assert HEDGE_SECONDS * 0.9 <= gap < HEDGE_SECONDS + 1
+    # The slow original was cancelled, not left streaming
+    assert wait_for(lambda: 0 in stub.disconnected)
+    assert 0 not in stub.finished
+
+
+@pytest.mark.parametrize("status", ["529", "500"])
+def test_overloaded_or_failing_model_falls_back(stub, generate, status):
+    stub.script = [status]
+
+    assert generate() == "ok answer from model-b #1"
+    assert [model for model, _ in stub.requests] == ["model-a", "model-b"]
+
+
+def test_everything_overloaded_raises(stub, generate):
+    stub.script = ["529", "529"]
+
+    with pytest.raises(anthropic.APIStatusError) as error:
+        generate()
+    assert error.value.status_code == 529
+    assert [model for model, _ in stub.requests] == ["model-a", "model-b"]
+
+
+def test_non_retryable_error_raises_at_once(stub, generate):
+    stub.script = ["400"]
+
+    with pytest.raises(anthropic.BadRequestError):
+        generate()
+    assert stub.requests == [("model-a", "400")]
+
+
+def test_hedge_without_budget_leaves_the_original_running(stub, generate, monkeypatch):
+    estimated = budget.estimate_tokens(dict(REQUEST, model="model-a"))
+    # Room for one attempt, not for the hedge
+    monkeypatch.setattr(budget, "DAILY_TOKEN_BUDGETS", {"default": estimated * 3 // 2})
+    stub.script = ["slow:1"]
+
+    assert generate() == "slow:1 answer from model-a #0"
+    assert stub.requests == [("model-a", "slow:1")]
+
+
+def test_rate_limiter_wait_is_not_first_token_latency(stub, generate, isolated):
+    estimated = budget.estimate_tokens(dict(REQUEST, model="model-a"))
+    # A drained bucket that takes twice the hedge threshold to refill
+    isolated.tokens = budget.TokenBucket(estimated * 60 / (HEDGE_SECONDS * 2))
+    isolated.tokens.level = 0
+
+    assert generate() == "ok answer from model-a #0"
+    # Long enough for a hedge queued behind the first attempt to get through the bucket
+    time.sleep(HEDGE_SECONDS * 3)
+    assert stub.requests == [("model-a", "ok")]
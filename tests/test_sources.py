@@ -0,0 +1,157 @@
+"""
+ApifyActorAdapter against a local stand-in for the Apify API (stubs.StubApify).
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("apify_client")
+from apify_client import ApifyClient  # noqa: E402
+
+import sources  # noqa: E402
+from stubs import StubApify  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+CUTOFF = NOW - timedelta(hours=24)
+
+
+def posts(start: int, count: int) -> list:
+    return [
+        {
+            "title": f"Post {i} about AI agents",
+            "body": f"Body {i}",
+            "url": f"https://reddit.example/{i}",
+            "createdAt": (NOW - timedelta(minutes=i % 600)).isoformat(),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class Adapter(sources.ApifyActorAdapter):
+    # One quick client-side retry (0 means the default of 8), so a failing page fails fast
+    def _client(self):
+        return ApifyClient(self.token, api_url=self.api_url, max_retries=1, min_delay_between_retries_millis=1)
+
+
+@pytest.fixture
+def apify():
+    stub = StubApify()
+    yield stub
+    stub.close()
+
+
+def make_adapter(apify, tmp_path, **kwargs) -> Adapter:
+    kwargs.setdefault("page_size", 100)
+    kwargs.setdefault("page_concurrency", 4)
+    return Adapter(token="test", api_url=apify.url, cursor_dir=str(tmp_path), poll_seconds=1, **kwargs)
+
+
+def read_cursor(adapter: Adapter) -> dict:
+    with open(adapter._cursor_path()) as f:
+        return json.load(f)
+
+
+def test_reads_every_page_concurrently(apify, tmp_path):
+    apify.datasets["ds"] = posts(0, 950)
+    apify.page_delay = 0.05
+    adapter = make_adapter(apify, tmp_path, dataset_id="ds")
+
+    items = adapter.fetch(CUTOFF)[adapter.name]
+
+    assert sorted(item["title"] for item in items) == sorted(f"Post {i} about AI agents" for i in range(950))
+    assert sorted(offset for _, offset in apify.item_requests) == list(range(0, 1000, 100))
+    assert apify.max_in_flight > 1
+    assert read_cursor(adapter)["offset"] == 950
+
+
+def test_resumes_from_saved_offset(apify, tmp_path):
+    apify.datasets["ds"] = posts(0, 250)
+    make_adapter(apify, tmp_path, dataset_id="ds").fetch(CUTOFF)
+
+    apify.datasets["ds"] += posts(250, 30)
+    apify.item_requests.clear()
+    # A fresh adapter, as in the next CLI run
+    adapter = make_adapter(apify, tmp_path, dataset_id="ds")
+    items = adapter.fetch(CUTOFF)[adapter.name]
+
+    assert apify.item_requests == [("ds", 250)]
+    assert len(items) == 280
+    assert read_cursor(adapter)["offset"] == 280
+
+
+def test_failed_middle_page_does_not_advance_offset(apify, tmp_path):
+    apify.datasets["ds"] = posts(0, 500)
+    apify.failing_offsets = {200}
+    adapter = make_adapter(apify, tmp_path, dataset_id="ds")
+
+    items = adapter.fetch(CUTOFF)[adapter.name]
+
+    assert len(items) == 200
+    assert read_cursor(adapter)["offset"] == 200
+
+    apify.failing_offsets.clear()
+    apify.item_requests.clear()
+    items = adapter.fetch(CUTOFF)[adapter.name]
+
+    assert min(offset for _, offset in apify.item_requests) == 200
+    assert len(items) == 500
+    assert len({item["link"] for item in items}) == 500
+    assert read_cursor(adapter)["offset"] == 500
+
+
+def test_actor_run_is_saved_before_it_finishes(apify, tmp_path):
+    apify.run_status = "RUNNING"
+    apify.run_items = posts(0, 150)
+    adapter = make_adapter(apify, tmp_path, actor_id="user/scraper")
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (adapter.fetch(CUTOFF), done.set()), daemon=True).start()
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            cursor = read_cursor(adapter)
+            if cursor["offset"] == 150:
+                break
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.05)
+
+    # Started once, recorded in the cursor, and partly read while still running
+    assert apify.started == 1
+    assert cursor["run_id"] == "run1" and cursor["dataset_id"] == "runds1"
+    assert cursor["offset"] == 150 and not cursor["finished"]
+    assert not done.is_set()
+
+    apify.datasets["runds1"] += posts(150, 50)
+    apify.runs["run1"]["status"] = "SUCCEEDED"
+    assert done.wait(5)
+    assert read_cursor(adapter)["offset"] == 200
+    assert read_cursor(adapter)["finished"]
+
+
+def test_pending_actor_run_is_resumed_not_restarted(apify, tmp_path):
+    apify.run_items = posts(0, 120)
+    adapter = make_adapter(apify, tmp_path, actor_id="user/scraper")
+    apify.failing_offsets = {100}
+
+    first = adapter.fetch(CUTOFF)[adapter.name]
+    assert apify.started == 1
+    assert len(first) == 100
+    assert not read_cursor(adapter)["finished"]
+
+    # The next run reads the rest of the same actor run instead of starting a new one
+    apify.failing_offsets.clear()
+    second = make_adapter(apify, tmp_path, actor_id="user/scraper").fetch(CUTOFF)[adapter.name]
+    assert apify.started == 1
+    assert len(second) == 120
+    assert read_cursor(adapter)["finished"]
+
+    # Once that run is fully read, the next fetch starts a new one
+    make_adapter(apify, tmp_path, actor_id="user/scraper").fetch(CUTOFF)
+    assert apify.started == 2
+    assert read_cursor(adapter)["run_id"] == "run2"
@@ -0,0 +1,42 @@
+"""
+Crash recovery in the package store (store.py).
+"""
+
+import store
+
+
+def test_append_after_another_process_crashed_mid_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_FSYNC", False)
+    root = str(tmp_path / "store")
+    writer = store.PackageStore(root)
+    first = writer.append("News", "first package")
+
+    # Another process died halfway through writing its record
+    frame = store.encode_record({"id": "torn", "tenant_id": "", "context": "x", "created": "", "content": "y" * 500})
+    with open(writer._segment_path(1), "ab") as f:
+        f.write(frame[: len(frame) // 2])
+
+    second = writer.append("News", "second package")
+
+    assert [e["id"] for e in writer.packages()] == [first, second]
+    assert [r["id"] for r in writer.iter_records()] == [first, second]
+    reader = store.PackageStore(root)
+    assert [r["content"] for r in reader.iter_records()] == ["first package", "second package"]
+
+
+def test_unindexed_record_of_a_crashed_process_is_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_FSYNC", False)
+    root = str(tmp_path / "store")
+    writer = store.PackageStore(root)
+    first = writer.append("News", "first package")
+
+    # Another process wrote its record but died before adding the index line
+    record = {"id": "orphan", "tenant_id": "", "brand": "Miss AI", "context": "x",
+              "created": "2026-01-01T00:00:00", "content": "orphan package"}
+    with open(writer._segment_path(1), "ab") as f:
+        f.write(store.encode_record(record))
+
+    second = writer.append("News", "second package")
+
+    assert [e["id"] for e in writer.packages()] == [first, "orphan", second]
+    assert [r["id"] for r in writer.iter_records()] == [first, "orphan", second]
@@ -0,0 +1,302 @@
+"""
+Miss AI – X Growth Architect | Multi-variant generation (best-of-N)
+===================================================================
+Generates N full content packages concurrently, splits each one into its
+sections, scores every post locally and keeps only the best combination.
+
+The ENGAGEABILITY SCORE written by the model is self-reported by the same
+call that writes the posts, so here each post is scored on:
+  - cheap heuristics that mirror the rules in SYSTEM_PROMPT
+    (hook length, character limits, plain typography, anchoring, poll shape)
+  - a learned score from our own engagement history (ENGAGEMENT_HISTORY_FILE
+    plus any X analytics imported with analytics.py)
+
+HOW TO RUN:
+    python3 main.py --variants 4 "OpenAI just released a new model"
+"""
+
+import json
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Maximum number of generation calls in flight at once
+VARIANT_CONCURRENCY = 4
+
+# Past posts with their engagement, one JSON object per line:
+#   {"text": "...", "impressions": 1234, "engagements": 56}
+ENGAGEMENT_HISTORY_FILE = os.path.join("output", "engagement_history.jsonl")
+
+# How much the learned score counts next to the heuristic score
+LEARNED_WEIGHT = 0.5
+
+# Section titles as they appear in the output format (prefix match)
+POST_SECTIONS = ["LONG POST", "SHORT POST 1", "SHORT POST 2", "SHORT POST 3", "POLL"]
+
+_SECTION_RE = re.compile(r"^## +(.+?) *$", re.MULTILINE)
+_TYPE_SPLIT_RE = re.compile(r"\s+[–-]\s+")
+_FOOTER_RE = re.compile(r"^\*\*Content Pillar:\*\*", re.MULTILINE)
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_LINK_RE = re.compile(r"https?://\S+")
+_OPTION_RE = re.compile(r"^- Option [A-D]:\s*\S", re.MULTILINE)
+_FANCY_CHARS = "—–“”‘’…"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PARSING
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_package(content: str) -> dict:
+    """
+    Split a generated content package into {section title: section body}.
+
+    Titles are kept exactly as written (e.g. "SHORT POST 1 – Funny or Meme Adjacent"),
+    bodies have the trailing "---" separator removed.
+    """
+    sections = {}
+    matches = list(_SECTION_RE.finditer(content))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        body = content[match.end():end].strip()
+        if body.endswith("---"):
+            body = body[:-3].rstrip()
+        sections[match.group(1)] = body
+    return sections
+
+
+def assemble_package(sections: dict) -> str:
+    """
+    Inverse of parse_package: join sections back into the output format.
+    """
+    parts = [f"## {title}\n{body}" for title, body in sections.items()]
+    return "---\n\n" + "\n\n---\n\n".join(parts) + "\n"
+
+
+def post_type(title: str) -> str:
+    """
+    What kind of post a section is, whatever its number: the part of the
+    title after the dash ("practical play for smb owners"), or the section
+    prefix ("long post", "poll") for titles without one.
+    """
+    parts = _TYPE_SPLIT_RE.split(title, maxsplit=1)
+    if len(parts) == 2 and title.upper().startswith("SHORT POST"):
+        return " ".join(parts[1].lower().split())
+    prefix = next((p for p in POST_SECTIONS if title.upper().startswith(p)), title.upper())
+    return prefix.lower()
+
+
+def post_text(body: str) -> str:
+    """
+    The publishable part of a post section: everything above **Content Pillar:**.
+    """
+    footer = _FOOTER_RE.search(body)
+    return (body[:footer.start()] if footer else body).strip()
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCORING
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _tokens(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def heuristic_score(section: str, text: str, bundle_words: set) -> float:
+    """
+    Score one post in [0, 1] using the rules from SYSTEM_PROMPT.
+    """
+    if not text:
+        return 0.0
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    score = 1.0
+
+    # Hook: two opening lines of about eight words each
+    hook_words = len(lines[0].split())
+    score -= min(abs(hook_words - 8) * 0.04, 0.3)
+    if section != "POLL" and len(lines) < 2:
+        score -= 0.1
+
+    # Length targets (links do not count towards the visible length)
+    visible = len(_LINK_RE.sub("", text).strip())
+    if section == "LONG POST":
+        score -= min(abs(visible - 1000) / 1000, 0.4)
+    elif section.startswith("SHORT POST") and visible > 100:
+        score -= min((visible - 100) / 100, 0.5)
+
+    # Plain typography only
+    if any(c in text for c in _FANCY_CHARS):
+        score -= 0.15
+
+    # Anchored to the news bundle and specific
+    if bundle_words:
+        overlap = len(_tokens(text) & bundle_words) / max(len(_tokens(text)), 1)
+        score += min(overlap, 0.2)
+    if any(c.isdigit() for c in text):
+        score += 0.05
+
+    if section == "POLL":
+        if "?" not in lines[0]:
+            score -= 0.2
+        score -= 0.1 * (4 - min(len(_OPTION_RE.findall(text)), 4))
+
+    return max(0.0, min(score, 1.0))
+
+
+class EngagementModel:
+    """
+    Tiny additive model over words: each word's weight is how much the
+    engagement rate of past posts containing it differs from the average.
+
+    With no history every prediction is 0.5, so it never outweighs the heuristics.
+    """
+
+    def __init__(self, history: list, smoothing: float = 5.0):
+        self.mean = 0.0
+        self.weights = {}
+        rates = []
+        for row in history:
+            impressions = row.get("impressions") or 0
+            if impressions <= 0:
+                continue
+            rates.append((_tokens(row.get("text", "")), row.get("engagements", 0) / impressions))
+        if not rates:
+            return
+
+        self.mean = sum(rate for _, rate in rates) / len(rates)
+        totals = {}
+        for words, rate in rates:
+            for word in words:
+                total, count = totals.get(word, (0.0, 0))
+                totals[word] = (total + rate - self.mean, count + 1)
+        # Shrink rare words towards zero so one lucky post does not dominate
+        self.weights = {w: total / (count + smoothing) for w, (total, count) in totals.items()}
+
+    @classmethod
+    def load(cls, path: str = ENGAGEMENT_HISTORY_FILE) -> "EngagementModel":
+        history = []
+        if os.path.exists(path):
+            with open(path) as f:
+                history = [json.loads(line) for line in f if line.strip()]
+
+        from analytics import get_store
+
+        store = get_store()
+        if store is not None:
+            history += [
+                {"text": text, "impressions": impressions, "engagements": engagements}
+                for text, impressions, engagements in zip(
+                    store.texts.tolist(), store.impressions.tolist(), store.engagements.tolist()
+                )
+            ]
+        return cls(history)
+
+    def predict(self, text: str) -> float:
+        """
+        Predicted engagement relative to the average, squashed into (0, 1).
+        """
+        if not self.mean:
+            return 0.5
+        deltas = [self.weights[w] for w in _tokens(text) if w in self.weights]
+        if not deltas:
+            return 0.5
+        relative = sum(deltas) / len(deltas) / self.mean
+        return 1 / (1 + math.exp(-4 * relative))
+
+
+def score_post(section: str, text: str, bundle_words: set, model: EngagementModel) -> float:
+    """
+    Combined local score: heuristics plus the weighted learned score.
+    """
+    return heuristic_score(section, text, bundle_words) + LEARNED_WEIGHT * model.predict(text)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BEST-OF-N
+# ─────────────────────────────────────────────────────────────────────────────
+
+def generate_variants(generate_fn, news_bundle: str, n: int) -> list:
+    """
+    Run generate_fn(news_bundle) n times concurrently, at most VARIANT_CONCURRENCY
+    at once. Failed calls are dropped; raises the last error if all of them fail.
+    """
+    variants = []
+    last_error = None
+    with ThreadPoolExecutor(max_workers=max(1, min(n, VARIANT_CONCURRENCY))) as pool:
+        futures = [pool.submit(generate_fn, news_bundle) for _ in range(n)]
+        for future in as_completed(futures):
+            try:
+                variants.append(future.result())
+            except Exception as e:
+                last_error = e
+    if not variants:
+        raise last_error
+    return variants
+
+
+def select_best(variants: list, news_bundle: str, model: EngagementModel = None) -> str:
+    """
+    Pick the highest scoring version of every post across the variants and
+    assemble them into one package.
+
+    The variant with the best long post sets the layout. Each of its posts is
+    replaced by the best post of the same type (see post_type) from any
+    variant, so a variant that numbers its short posts differently cannot
+    leave the package with two posts of one type and none of another.
+
+    METADATA and ENGAGEABILITY SCORE come from the layout variant, with the
+    local score added under the model's own score.
+    """
+    model = model or EngagementModel.load()
+    bundle_words = _tokens(news_bundle)
+    parsed = [parse_package(v) for v in variants]
+
+    # (score, variant index, title, body) for every post in every variant
+    posts = []
+    for i, sections in enumerate(parsed):
+        for title, body in sections.items():
+            prefix = next((p for p in POST_SECTIONS if title.upper().startswith(p)), None)
+            if prefix:
+                posts.append((score_post(prefix, post_text(body), bundle_words, model), i, title, body))
+
+    long_posts = [post for post in posts if post[2].upper().startswith("LONG POST")]
+    if not long_posts:
+        return variants[0]
+    winner = max(long_posts, key=lambda c: c[0])[1]
+
+    chosen = {}
+    used = set()
+    for title in parsed[winner]:
+        if not any(title.upper().startswith(p) for p in POST_SECTIONS):
+            continue
+        kind = post_type(title)
+        candidates = [
+            post for post in posts
+            if post_type(post[2]) == kind and (post[1], post[2]) not in used
+        ]
+        best = max(candidates, key=lambda c: c[0])
+        used.add((best[1], best[2]))
+        chosen[title] = best
+
+    result = {}
+    for title, body in parsed[winner].items():
+        if title.upper().startswith("ENGAGEABILITY SCORE"):
+            total = sum(c[0] for c in chosen.values()) / len(chosen)
+            body += f"\n**Local Score:** {total:.2f} (best of {len(variants)} variants)"
+        if title in chosen:
+            # Keep the layout's title (its numbering) with the winning body
+            body = chosen[title][3]
+        result[title] = body
+    return assemble_package(result)
+
+
+def generate_best_of_n(generate_fn, news_bundle: str, n: int) -> str:
+    """
+    Generate n variants concurrently and return the best combined package.
+    """
+    variants = generate_variants(generate_fn, news_bundle, n)
+    if len(variants) == 1:
+        return variants[0]
+    return select_best(variants, news_bundle)
@@ -0,0 +1,184 @@
+"""
+Miss AI – X Growth Architect | Rolling article window
+====================================================
+Keeps the last N hours of articles from many feeds in memory, compactly:
+
+  - Article records use __slots__ (no per-entry dict), store the publish
+    time as a float and the feed as a small int into an interned SourceTable
+  - a min-heap ordered by publish time evicts articles that fall out of the
+    window on every insert, so memory follows the window, not the uptime
+  - repeated stories (same link, or same title from another feed) are
+    deduplicated on insert, keeping the freshest copy; re-polling a feed
+    that has not changed adds nothing
+
+Readers get plain article dicts (see main._fetch_one_feed) from items(),
+so ranking, enrichment and the bundle are unchanged.
+
+Measure with:  python3 bench.py memory
+"""
+
+import heapq
+import itertools
+import sys
+import time
+from datetime import datetime, timezone
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONFIGURATION
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Default window length (hours)
+WINDOW_HOURS = 24
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RECORDS
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SourceTable:
+    """
+    Interned feed URLs: each URL is stored once and articles refer to it by index.
+    """
+
+    __slots__ = ("urls", "ids")
+
+    def __init__(self):
+        self.urls = []
+        self.ids = {}
+
+    def intern(self, url: str) -> int:
+        source_id = self.ids.get(url)
+        if source_id is None:
+            source_id = self.ids[url] = len(self.urls)
+            self.urls.append(sys.intern(url))
+        return source_id
+
+
+class Article:
+    """
+    One article in the window. `published` is a UTC timestamp (seconds).
+    """
+
+    __slots__ = ("title", "summary", "link", "published", "source", "images", "title_key", "alive")
+
+    def __init__(self, title: str, summary: str, link: str, published: float, source: int, images: tuple = ()):
+        self.title = title
+        self.summary = summary
+        self.link = link
+        self.published = published
+        self.source = source
+        self.images = images
+        self.title_key = " ".join(title.lower().split())
+        self.alive = True
+
+    def keys(self) -> tuple:
+        """
+        Dedupe keys: the link and the normalised title.
+        """
+        return tuple(key for key in (self.link, self.title_key) if key)
+
+    def as_dict(self, sources: SourceTable) -> dict:
+        return {
+            "title": self.title,
+            "summary": self.summary,
+            "link": self.link,
+            "published": datetime.fromtimestamp(self.published, tz=timezone.utc),
+            "source_url": sources.urls[self.source],
+            "images": list(self.images),
+        }
+
+# ─────────────────────────────────────────────────────────────────────────────
+# WINDOW
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ArticleWindow:
+    """
+    Articles published in the last `hours`, deduplicated, oldest evicted first.
+
+    Replaced duplicates are only marked dead and leave the heap when they
+    age out, so every insert is O(log n).
+    """
+
+    def __init__(self, hours: float = WINDOW_HOURS):
+        self.span = hours * 3600
+        self.sources = SourceTable()
+        self.heap = []
+        self.by_key = {}
+        self.count = 0
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def evict(self, now: float = None):
+        """
+        Drop every article published before the start of the window.
+        """
+        cutoff = (now if now is not None else time.time()) - self.span
+        heap = self.heap
+        while heap and heap[0][0] < cutoff:
+            _, _, article = heapq.heappop(heap)
+            if article.alive:
+                self._forget(article)
+
+    def _forget(self, article: Article):
+        article.alive = False
+        self.count -= 1
+        for key in article.keys():
+            if self.by_key.get(key) is article:
+                del self.by_key[key]
+
+    def add(self, article: Article, now: float = None) -> bool:
+        """
+        Insert one article. Returns False if it is outside the window or an
+        equally fresh copy of the story is already in it.
+        """
+        now = now if now is not None else time.time()
+        self.evict(now)
+        if article.published < now - self.span:
+            return False
+        return self._insert(article)
+
+    def _insert(self, article: Article) -> bool:
+        existing = {id(a): a for a in map(self.by_key.get, article.keys()) if a is not None}
+        if any(a.published >= article.published for a in existing.values()):
+            return False
+        for old in existing.values():
+            self._forget(old)
+
+        for key in article.keys():
+            self.by_key[key] = article
+        heapq.heappush(self.heap, (article.published, next(self._seq), article))
+        self.count += 1
+        return True
+
+    def extend(self, url: str, entries: list, now: float = None) -> int:
+        """
+        Insert article dicts from one feed (see main.parse_feed).
+        Returns how many of them are inside the window.
+        """
+        now = now if now is not None else time.time()
+        self.evict(now)
+        source = self.sources.intern(url)
+        cutoff = now - self.span
+        recent = 0
+        for entry in entries:
+            published = entry["published"].timestamp()
+            if published < cutoff:
+                continue
+            recent += 1
+            # Fast path for re-polled entries: same link, not newer
+            known = self.by_key.get(entry["link"])
+            if known is not None and known.published >= published:
+                continue
+            images = tuple(entry.get("images") or ())
+            self._insert(Article(entry["title"], entry["summary"], entry["link"], published, source, images))
+        return recent
+
+    def items(self, now: float = None) -> list:
+        """
+        Article dicts for everything in the window, newest first.
+        """
+        self.evict(now)
+        alive = [article for _, _, article in self.heap if article.alive]
+        alive.sort(key=lambda a: a.published, reverse=True)
+        return [article.as_dict(self.sources) for article in alive]